@@ -0,0 +1,173 @@
+import pandas as pd
+
+
+# --- Métricas que se grafican por año: columna de salida, columna origen y agregación ---
+METRICAS_ANIO = {
+    "bitacoras": ("Bitácoras", None, "size"),
+    "area": ("Area_total_de_la_parcela(ha)", "Area_total_de_la_parcela(ha)", "sum"),
+    "parcelas": ("Id_Parcela(Unico)", "Id_Parcela(Unico)", "nunique"),
+    "productores": ("Id_Productor", "Id_Productor", "nunique"),
+}
+
+
+def kpis(datos_filtrados):
+    """Totales de bitácoras, área, parcelas y productores de la selección"""
+    return {
+        "bitacoras": len(datos_filtrados),
+        "area": datos_filtrados["Area_total_de_la_parcela(ha)"].sum(),
+        "parcelas": datos_filtrados["Id_Parcela(Unico)"].nunique() if "Id_Parcela(Unico)" in datos_filtrados.columns else 0,
+        "productores": datos_filtrados["Id_Productor"].nunique() if "Id_Productor" in datos_filtrados.columns else 0,
+    }
+
+
+def serie_por_anio(datos_filtrados, metrica, por_tipo=False):
+    """Agrega una métrica por año (y por tipo de parcela si se pide)"""
+    nombre, columna, agregacion = METRICAS_ANIO[metrica]
+    llaves = ["Anio", "Tipo_parcela"] if por_tipo else "Anio"
+    agrupado = datos_filtrados.groupby(llaves, observed=True)
+    if agregacion == "size":
+        return agrupado.size().reset_index(name=nombre)
+    return getattr(agrupado[columna], agregacion)().reset_index()
+
+
+def genero_tabla(genero):
+    """Género con las etiquetas de la tabla de productores(as)"""
+    return genero.fillna("n/a").replace({
+        "Hombre": "Masculino",
+        "Mujer": "Femenino",
+        "NA": "n/a",
+        "NA..": "n/a"
+    })
+
+
+def distribucion_genero(datos_filtrados, registros=None):
+    """Registros y porcentaje por género, siempre con las tres categorías.
+
+    `registros` (bitácoras por género ya contadas, p. ej. desde el modelo estrella) evita recorrer las filas.
+    """
+    categorias_genero = ["Masculino", "Femenino", "NA.."]
+    if registros is None:
+        genero = datos_filtrados["Genero"].fillna("NA..")
+        registros = genero.groupby(genero).size()
+    datos_genero = registros.rename_axis("Genero").reset_index(name="Registros")
+    datos_genero = datos_genero.set_index("Genero").reindex(categorias_genero, fill_value=0).reset_index()
+
+    total_registros = datos_genero["Registros"].sum()
+    datos_genero["Porcentaje"] = (datos_genero["Registros"] / total_registros * 100) if total_registros > 0 else 0
+    return datos_genero
+
+
+def tabla_proyectos(datos_filtrados=None, conteo_mix=None):
+    """Bitácoras por año, proyecto dominante y distribución (%) por categoría y proyecto.
+
+    `conteo_mix` (registros por año, categoría y proyecto ya contados, p. ej. desde el modelo estrella) evita recorrer las filas.
+    """
+    # --- Recuento por Año, Categoría y Proyecto ---
+    if conteo_mix is None:
+        conteo_mix = (
+            datos_filtrados
+            .groupby(["Anio", "Categoria_Proyecto", "Proyecto"], observed=True)
+            .size()
+            .reset_index(name="Registros")
+        )
+
+    # Total por año
+    total_anual = conteo_mix.groupby("Anio")["Registros"].sum().reset_index(name="Total")
+
+    # Calcular porcentaje del total por año
+    conteo_mix = conteo_mix.merge(total_anual, on="Anio")
+    conteo_mix["Porcentaje"] = (conteo_mix["Registros"] / conteo_mix["Total"] * 100).round(1)
+
+    # Obtener el proyecto dominante por año
+    proyecto_max = (
+        conteo_mix.loc[conteo_mix.groupby("Anio")["Porcentaje"].idxmax()]
+        .set_index("Anio")["Proyecto"]
+    )
+
+    # Crear tabla con MultiIndex (Categoria -> Proyecto) como columnas
+    conteo_pivot = conteo_mix.pivot_table(
+        index="Anio",
+        columns=["Categoria_Proyecto", "Proyecto"],
+        values="Porcentaje",
+        fill_value=0,
+        observed=True
+    )
+
+    # Insertar "Numero de Bitacoras" al inicio
+    conteo_pivot.insert(0, "🔢 Bitacoras ", total_anual.set_index("Anio")["Total"])
+
+    # Insertar "Proyecto Dominante" justo después (posición 1)
+    conteo_pivot.insert(1, "🏆 Proyecto Dominante", proyecto_max)
+
+    # Convertir tabla final y redondear solo columnas numéricas
+    tabla_final = conteo_pivot.copy()
+
+    for col in tabla_final.columns:
+        if pd.api.types.is_numeric_dtype(tabla_final[col]):
+            # Redondear floats a 2 decimales
+            tabla_final[col] = tabla_final[col].apply(lambda x: round(x, 2) if pd.notnull(x) else x)
+
+    # Asegurar que "🔢 Bitacoras " sea entero
+    if "🔢 Bitacoras " in tabla_final.columns:
+        tabla_final["🔢 Bitacoras "] = tabla_final["🔢 Bitacoras "].astype(int)
+    return tabla_final
+
+
+def tabla_categorias(datos_filtrados=None, conteo=None):
+    """Distribución (%) de bitácoras por categoría del proyecto en cada año.
+
+    `conteo` (registros por año y categoría ya contados) evita recorrer las filas.
+    """
+    # Agrupar por año y categoría
+    if conteo is None:
+        conteo = datos_filtrados.groupby(["Anio", "Categoria_Proyecto"], observed=True).size().reset_index(name="Registros")
+    else:
+        conteo = conteo.copy()
+
+    # Calcular total por año
+    conteo["Total_Anio"] = conteo.groupby("Anio")["Registros"].transform("sum")
+
+    # Calcular porcentaje
+    conteo["Porcentaje"] = (conteo["Registros"] / conteo["Total_Anio"] * 100)
+
+    # Pivotear para mostrar cada categoría como columna
+    tabla_pct = conteo.pivot_table(
+        index="Anio",
+        columns="Categoria_Proyecto",
+        values="Porcentaje",
+        fill_value=0,
+        observed=True
+    )
+
+    # Redondear a 2 decimales y dejar 'Anio' como columna normal
+    return tabla_pct.round(2).reset_index()
+
+
+def tabla_productores_genero(datos_filtrados=None, tabla_base=None):
+    """Productores(as) únicos por proyecto, año y género, con totales.
+
+    `tabla_base` (productores distintos por proyecto, año y género ya contados) evita recorrer las filas.
+    """
+    if tabla_base is None:
+        # Normalizar valores de género
+        genero = genero_tabla(datos_filtrados["Genero"])
+
+        # Tabla base con conteo único de productores
+        tabla_base = (
+            datos_filtrados
+            .groupby(["Proyecto", "Anio", genero], observed=True)["Id_Productor"]
+            .nunique()
+            .reset_index()
+        )
+
+    # Crear tabla pivote
+    return tabla_base.pivot_table(
+        index=["Proyecto", "Anio"],
+        columns="Genero",
+        values="Id_Productor",
+        aggfunc="sum",
+        fill_value=0,
+        observed=True,
+        margins=True,
+        margins_name="Grand Total"
+    ).reset_index()
@@ -0,0 +1,92 @@
+import numpy as np
+import pandas as pd
+
+from catalogos import centros_estados
+
+
+# --- Límites aproximados de México para validar coordenadas ---
+LATITUD_MEXICO = (14.3, 32.8)
+LONGITUD_MEXICO = (-118.5, -86.5)
+
+# --- Área máxima creíble para una parcela ---
+AREA_MAXIMA_HA = 5000
+
+# --- Motivos de cuarentena: código -> descripción (el orden define el bit de cada motivo) ---
+MOTIVOS = {
+    "ANIO_FUERA_DE_RANGO": "Año vacío o fuera del periodo del tablero",
+    "COORDENADAS_INVERTIDAS": "Latitud y longitud intercambiadas",
+    "COORDENADAS_FUERA_DE_MEXICO": "Coordenadas fuera de México",
+    "AREA_INVALIDA": f"Área no numérica, negativa o mayor a {AREA_MAXIMA_HA:,} ha",
+    "ESTADO_DESCONOCIDO": "Estado capturado que no está en el catálogo de estados",
+}
+
+# --- Banderas informativas: se cuentan en el resumen pero la fila se conserva ---
+SIN_COORDENADAS = "SIN_COORDENADAS"
+SIN_ESTADO = "SIN_ESTADO"
+
+# --- Valor con el que la ingesta rellena los textos vacíos ---
+VALOR_VACIO = "NA"
+
+
+def _entre(serie, limites):
+    return serie.between(*limites).to_numpy()
+
+
+def validar(datos, anio_minimo, anio_maximo):
+    """Valida todas las filas de una vez y separa las que no pasan a una tabla de cuarentena.
+
+    Recibe los datos con `Anio`, área y coordenadas ya convertidos a número (con NaN
+    donde el valor original no era numérico) y regresa `(limpios, cuarentena, resumen)`.
+    """
+    banderas = np.zeros(len(datos), dtype=np.int64)
+
+    def marcar(codigo, mascara):
+        nonlocal banderas
+        banderas |= np.where(mascara, 1 << list(MOTIVOS).index(codigo), 0)
+
+    anio = datos["Anio"]
+    marcar("ANIO_FUERA_DE_RANGO", (anio.isna() | (anio < anio_minimo) | (anio > anio_maximo)).to_numpy())
+
+    sin_coordenadas = np.zeros(len(datos), dtype=bool)
+    if {"Latitud", "Longitud"}.issubset(datos.columns):
+        latitud, longitud = datos["Latitud"], datos["Longitud"]
+        sin_coordenadas = (latitud.isna() | longitud.isna()).to_numpy()
+        en_mexico = _entre(latitud, LATITUD_MEXICO) & _entre(longitud, LONGITUD_MEXICO)
+        invertidas = _entre(latitud, LONGITUD_MEXICO) & _entre(longitud, LATITUD_MEXICO)
+        marcar("COORDENADAS_INVERTIDAS", invertidas)
+        marcar("COORDENADAS_FUERA_DE_MEXICO", ~sin_coordenadas & ~en_mexico & ~invertidas)
+
+    area = datos["Area_total_de_la_parcela(ha)"]
+    marcar("AREA_INVALIDA", (area.isna() | (area < 0) | (area > AREA_MAXIMA_HA)).to_numpy())
+
+    # Se valida cada estado distinto una sola vez y el resultado se expande a las filas;
+    # un estado vacío solo se cuenta, la cuarentena es para estados fuera del catálogo
+    codigos_estado, estados = pd.factorize(datos["Estado"])
+    vacios = np.array([e == VALOR_VACIO for e in estados], dtype=bool)
+    conocidos = np.array([e in centros_estados for e in estados], dtype=bool) | vacios
+    ninguno = np.zeros(len(datos), dtype=bool)
+    sin_estado = vacios[codigos_estado] if len(estados) else ninguno
+    marcar("ESTADO_DESCONOCIDO", ~conocidos[codigos_estado] if len(estados) else ninguno)
+
+    en_cuarentena = banderas != 0
+    cuarentena = datos[en_cuarentena].copy()
+    codigos_cuarentena, combinaciones = pd.factorize(banderas[en_cuarentena])
+    textos = np.array(
+        [", ".join(c for i, c in enumerate(MOTIVOS) if b & (1 << i)) for b in combinaciones],
+        dtype=object
+    )
+    cuarentena["Motivo"] = textos[codigos_cuarentena] if len(combinaciones) else []
+    limpios = datos[~en_cuarentena]
+
+    filas = [
+        (codigo, descripcion, int(((banderas >> i) & 1).sum()))
+        for i, (codigo, descripcion) in enumerate(MOTIVOS.items())
+    ]
+    filas.append((SIN_COORDENADAS, "Sin coordenadas (se conserva, no aparece en los mapas)", int((sin_coordenadas & ~en_cuarentena).sum())))
+    filas.append((SIN_ESTADO, "Sin estado (se conserva)", int((sin_estado & ~en_cuarentena).sum())))
+    resumen = {
+        "total": len(datos),
+        "limpias": len(limpios),
+        "motivos": pd.DataFrame(filas, columns=["Motivo", "Descripción", "Bitácoras"]),
+    }
+    return limpios, cuarentena, resumen
@@ -0,0 +1,125 @@
+import geopandas as gpd
+import numpy as np
+import pandas as pd
+
+from catalogos import siglas_hub
+from datos import ARCHIVO_HUBS
+from normalizacion import clave_canonica
+
+
+# --- Albers equivalente para México: las áreas se miden en m² sin deformación apreciable ---
+CRS_ALBERS_MEXICO = "+proj=aea +lat_1=14.5 +lat_2=32.5 +lat_0=12 +lon_0=-102 +datum=WGS84 +units=m +no_defs"
+# "Capa Hubs MasAgro/HubsMasAgro.prj" es WGS84 geográfico
+CRS_HUBS = "EPSG:4326"
+
+SIN_POLIGONO = -1
+
+
+def leer_hubs(archivo=ARCHIVO_HUBS):
+    """Polígonos de los HUBs, con un nombre por polígono aunque el archivo no lo traiga"""
+    hubs = gpd.read_parquet(archivo)
+    if "Nombre" not in hubs.columns:
+        hubs["Nombre"] = [f"HUB {i}" for i in range(len(hubs))]
+    return hubs
+
+
+def poligonos_de_hub(hubs, hub):
+    """Polígonos que corresponden a un valor de `HUB_Agroecológico` (vacío si ninguno coincide).
+
+    Se compara sin acentos ni mayúsculas contra la sigla y el nombre del polígono, o
+    contra la sigla que `siglas_hub` asigna al nombre del HUB.
+    """
+    clave = " ".join(w for w in clave_canonica(hub).split() if w != "hub")
+    sigla = clave_canonica(siglas_hub.get(clave, clave))
+    siglas = hubs["SIGLA"].fillna("").map(clave_canonica) if "SIGLA" in hubs.columns else pd.Series("", index=hubs.index)
+    coincide = (siglas == sigla) | (hubs["Nombre"].map(clave_canonica) == clave_canonica(hub))
+    return hubs[coincide.to_numpy()]
+
+
+class CoberturaHubs:
+    """Indicadores por polígono de HUB, preparados una vez por snapshot de datos y geometrías.
+
+    Las áreas de los polígonos se calculan reproyectando a Albers; cada ubicación distinta
+    de la dimensión de parcelas se asigna a su polígono con un solo spatial join. Con eso,
+    las métricas de cualquier selección son conteos sobre los hechos del modelo estrella
+    de las celdas seleccionadas.
+    """
+
+    def __init__(self, modelo, hubs):
+        if hubs.crs is None:
+            hubs = hubs.set_crs(CRS_HUBS)
+        hubs = hubs.to_crs(CRS_HUBS)
+        self.hubs = pd.DataFrame({
+            "Nombre": hubs["Nombre"].to_numpy(),
+            "SIGLA": hubs["SIGLA"].fillna("").to_numpy() if "SIGLA" in hubs.columns else "",
+            "Área del polígono (ha)": hubs.to_crs(CRS_ALBERS_MEXICO).area.to_numpy() / 10_000,
+        })
+
+        # Punto en polígono por ubicación distinta de las parcelas, no por bitácora
+        parcelas = modelo.dim_parcela
+        ubicacion = parcelas.groupby(["Latitud", "Longitud"], sort=False).ngroup().fillna(-1).to_numpy(dtype=np.int64)
+        primeras = np.unique(ubicacion[ubicacion >= 0], return_index=True)[1]
+        lugares = parcelas.iloc[np.flatnonzero(ubicacion >= 0)[primeras]]
+        puntos = gpd.GeoDataFrame(
+            geometry=gpd.points_from_xy(lugares["Longitud"], lugares["Latitud"]),
+            crs=CRS_HUBS
+        )
+        unidos = gpd.sjoin(puntos, hubs[["geometry"]].reset_index(drop=True), how="left", predicate="within")
+        # Si los polígonos se traslapan, la ubicación se queda con el primero
+        poligono_lugar = unidos.groupby(level=0)["index_right"].min().fillna(SIN_POLIGONO).to_numpy(dtype=np.int64)
+        poligono_lugar = np.append(poligono_lugar, SIN_POLIGONO)  # ubicación -1 (sin coordenadas)
+
+        self.modelo = modelo
+        self.poligono_parcela = poligono_lugar[ubicacion].astype(np.int16)
+        self.anios = np.asarray(modelo.anios, dtype=np.int64)
+
+    def _dentro(self, mascara):
+        """Hechos de la selección que caen en algún polígono: (polígono, año, parcela, área mayor)"""
+        modelo = self.modelo
+        seleccion = modelo.seleccion(mascara)
+        poligono = self.poligono_parcela[modelo.hechos["clave_parcela"].to_numpy()[seleccion]].astype(np.int64)
+        dentro = poligono != SIN_POLIGONO
+        seleccion = seleccion[dentro]
+        return (
+            poligono[dentro],
+            self.anios[modelo.codigo_anio[seleccion]],
+            modelo.atributo("Id_Parcela(Unico)", seleccion)[0].astype(np.int64),
+            modelo.hechos["area_maxima"].to_numpy()[seleccion],
+        )
+
+    @staticmethod
+    def _por_parcela(grupo, parcela, area):
+        """Una entrada por (grupo, parcela) distinta con el área mayor registrada de la parcela.
+
+        Una parcela atendida en varios años o ciclos tiene varias bitácoras; su área
+        se cuenta una sola vez en cada grupo.
+        """
+        n_parcelas = int(parcela.max()) + 1 if len(parcela) else 1
+        llave = grupo * n_parcelas + parcela
+        orden = np.argsort(llave, kind="stable")
+        unicas, inicios = np.unique(llave[orden], return_index=True)
+        if not len(unicas):
+            return unicas, np.zeros(0)
+        return unicas // n_parcelas, np.maximum.reduceat(area[orden], inicios)
+
+    def metricas(self, mascara):
+        """Parcelas, área atendida, densidad y cobertura por polígono dentro de la selección"""
+        poligono, _, parcela, area = self._dentro(mascara)
+        n_poligonos = len(self.hubs)
+        poligono, area = self._por_parcela(poligono, parcela, area)
+
+        tabla = self.hubs.copy()
+        tabla["Parcelas"] = np.bincount(poligono, minlength=n_poligonos)
+        tabla["Área atendida (ha)"] = np.bincount(poligono, weights=area, minlength=n_poligonos)
+        tabla["Parcelas por km²"] = tabla["Parcelas"] / (tabla["Área del polígono (ha)"] / 100)
+        tabla["Cobertura (%)"] = tabla["Área atendida (ha)"] / tabla["Área del polígono (ha)"] * 100
+        return tabla
+
+    def cobertura_anual(self, mascara):
+        """Área atendida en cada año como porcentaje del área de cada polígono"""
+        poligono, anio, parcela, area = self._dentro(mascara)
+        anios, codigo_anio = np.unique(anio, return_inverse=True)
+        grupo, area = self._por_parcela(poligono * len(anios) + codigo_anio, parcela, area)
+        area = np.bincount(grupo, weights=area, minlength=len(self.hubs) * len(anios))
+        cobertura = area.reshape(len(self.hubs), len(anios)) / self.hubs["Área del polígono (ha)"].to_numpy()[:, None] * 100
+        return pd.DataFrame(cobertura, index=pd.Index(self.hubs["Nombre"], name="Polígono"), columns=anios)
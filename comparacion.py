@@ -0,0 +1,165 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+# --- Dimensiones por las que se puede desglosar la comparación ---
+DIMENSIONES = {
+    "Total": None,
+    "HUB": "HUB_Agroecológico",
+    "Proyecto": "Proyecto",
+}
+
+# --- Identificadores cuyos conjuntos se guardan por periodo: nombre -> columna ---
+IDENTIFICADORES = {
+    "Productores": "Id_Productor",
+    "Parcelas": "Id_Parcela(Unico)",
+}
+
+
+class AlmacenPeriodos:
+    """Conjuntos de productores y parcelas por celda del cubo de facetas, indexados una sola vez.
+
+    Un periodo es un año (`(anio, None)`) o un año y ciclo (`(anio, ciclo)`). Cada celda
+    del índice de facetas tiene un solo año, ciclo, HUB y proyecto, así que para cada
+    celda se guardan sus bitácoras, su área y los pares distintos (celda, identificador),
+    separados por año y tomados de los hechos del modelo estrella. Cualquier selección de filtros se responde uniendo los conjuntos
+    de las celdas seleccionadas de cada periodo, sin recorrer las bitácoras.
+    """
+
+    def __init__(self, modelo):
+        indice_facetas = modelo.indice
+        self.indice = indice_facetas
+        cubo = indice_facetas.cubo
+        self.anio_celda = np.asarray(indice_facetas.valores["Anio"], dtype=np.int64)[cubo["Anio"]]
+        self.ciclo_celda = cubo["Ciclo"]
+        self.ciclos = indice_facetas.valores["Ciclo"]
+        self.periodos = {
+            "Año": sorted((int(a), None) for a in np.unique(self.anio_celda)),
+            "Año y Ciclo": sorted(
+                {(int(a), str(self.ciclos[c])) for a, c in zip(self.anio_celda, self.ciclo_celda)}
+            ),
+        }
+        self.valores = {
+            nombre: pd.Index(["Total"]) if columna is None else indice_facetas.valores[columna]
+            for nombre, columna in DIMENSIONES.items()
+            if columna is None or columna in cubo
+        }
+
+        # Los hechos del modelo estrella ya vienen agregados y ordenados por celda
+        celda_hecho = modelo.hechos["celda"].to_numpy().astype(np.int64)
+        self.area_celda = np.bincount(celda_hecho, weights=modelo.hechos["area"].to_numpy(), minlength=len(indice_facetas))
+
+        # Pares distintos (celda, identificador) de cada año: {(nombre, anio): (celdas, códigos)}
+        self.n_ids = {}
+        self.pares = {}
+        todos = np.arange(len(celda_hecho))
+        for nombre, columna in IDENTIFICADORES.items():
+            if columna not in modelo.codigos:
+                continue
+            ids, etiquetas = modelo.atributo(columna, todos)
+            n_ids = max(len(etiquetas), 1)
+            llaves = np.unique(celda_hecho * n_ids + ids)
+            celdas = llaves // n_ids
+            anios = self.anio_celda[celdas]
+            for anio in np.unique(anios):
+                en_anio = anios == anio
+                self.pares[(nombre, int(anio))] = (celdas[en_anio], llaves[en_anio] % n_ids)
+            self.n_ids[nombre] = n_ids
+
+        self._memoria = {}
+        self._candado = threading.Lock()
+
+    # La memoria de comparaciones y el candado son propios de cada proceso
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k not in ("_memoria", "_candado")}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self._memoria = {}
+        self._candado = threading.Lock()
+
+    def _en_periodo(self, periodo, celdas):
+        """Celdas seleccionadas que caen en el periodo"""
+        anio, ciclo = periodo
+        en_periodo = celdas & (self.anio_celda == anio)
+        if ciclo is not None:
+            en_periodo &= self.ciclo_celda == self.ciclos.get_loc(ciclo)
+        return en_periodo
+
+    @staticmethod
+    def _fila(dimension, valor, totales, identificadores):
+        """Fila de la comparación a partir de los conteos (A, B) de cada métrica"""
+        fila = {dimension: valor}
+        for metrica, (a, b) in totales.items():
+            fila[f"{metrica} A"] = a
+            fila[f"{metrica} B"] = b
+            fila[f"Crecimiento {metrica} (%)"] = (b - a) / a * 100 if a else np.nan
+        for nombre, (a, b, retenidos) in identificadores.items():
+            fila[f"{nombre} A"] = a
+            fila[f"{nombre} B"] = b
+            fila[f"Crecimiento {nombre} (%)"] = (b - a) / a * 100 if a else np.nan
+            fila[f"{nombre} retenidos"] = retenidos
+            fila[f"Retención {nombre} (%)"] = retenidos / a * 100 if a else np.nan
+            fila[f"{nombre} nuevos"] = b - retenidos
+            fila[f"{nombre} que no regresan"] = a - retenidos
+        return fila
+
+    def comparar(self, periodo_a, periodo_b, dimension="Total", celdas=None):
+        """Crecimiento, retención y nuevos/perdidos entre dos periodos por valor de la dimensión.
+
+        `celdas` es una máscara del cubo de facetas (la selección de los filtros); sin ella
+        se comparan todas las bitácoras y el resultado se guarda en la memoria interna.
+        """
+        clave = (periodo_a, periodo_b, dimension)
+        if celdas is None:
+            with self._candado:
+                if clave in self._memoria:
+                    return self._memoria[clave]
+            seleccion = np.ones(len(self.indice), dtype=bool)
+        else:
+            seleccion = celdas
+
+        columna = DIMENSIONES[dimension]
+        codigos = np.zeros(len(self.indice), dtype=np.int64) if columna is None else self.indice.cubo[columna].astype(np.int64)
+        n_valores = len(self.valores[dimension])
+        en_a = self._en_periodo(periodo_a, seleccion)
+        en_b = self._en_periodo(periodo_b, seleccion)
+
+        def por_valor(mascara, pesos):
+            return np.bincount(codigos[mascara], weights=pesos[mascara], minlength=n_valores)
+
+        bitacoras = [por_valor(m, self.indice.conteos).astype(np.int64) for m in (en_a, en_b)]
+        area = [por_valor(m, self.area_celda) for m in (en_a, en_b)]
+
+        # Unión de los pares (valor de la dimensión, identificador) de las celdas de cada periodo
+        vacio = (np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        conteos_ids = {}
+        for nombre, n_ids in self.n_ids.items():
+            conjuntos = []
+            for (anio, _), en_periodo in ((periodo_a, en_a), (periodo_b, en_b)):
+                celdas_anio, ids = self.pares.get((nombre, anio), vacio)
+                elegidos = en_periodo[celdas_anio]
+                conjuntos.append(np.unique(codigos[celdas_anio[elegidos]] * n_ids + ids[elegidos]))
+            retenidos = np.intersect1d(*conjuntos, assume_unique=True)
+            conteos_ids[nombre] = [np.bincount(pares // n_ids, minlength=n_valores) for pares in (*conjuntos, retenidos)]
+
+        resultado = pd.DataFrame([
+            self._fila(
+                dimension, valor,
+                {"Bitácoras": (int(bitacoras[0][i]), int(bitacoras[1][i])), "Área (ha)": (area[0][i], area[1][i])},
+                {nombre: tuple(int(c[i]) for c in conteos) for nombre, conteos in conteos_ids.items()}
+            )
+            for i, valor in enumerate(self.valores[dimension])
+            if bitacoras[0][i] or bitacoras[1][i]
+        ])
+        if celdas is None:
+            with self._candado:
+                self._memoria[clave] = resultado
+        return resultado
+
+
+def etiqueta_periodo(periodo):
+    anio, ciclo = periodo
+    return str(anio) if ciclo is None else f"{anio} {ciclo}"
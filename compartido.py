@@ -0,0 +1,163 @@
+import contextlib
+import fcntl
+import os
+import pickle
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from pyarrow import ArrowException, Table, feather
+
+
+# --- Carpeta compartida por todos los procesos del servidor en el mismo equipo ---
+DIRECTORIO = os.environ.get("TABLERO_SNAPSHOTS", os.path.join(tempfile.gettempdir(), "tablero_snapshots"))
+
+# Arreglos numéricos a partir de este tamaño van a su propio .npy y se abren con mmap
+BYTES_MINIMOS_MMAP = 64 * 1024
+
+# Errores al escribir un snapshot: quien lo construyó puede seguir con su copia en memoria
+ERRORES_ESCRITURA = (ArrowException, pickle.PicklingError, TypeError, OSError)
+
+# Arrow regresa copias privadas de estas columnas; sus arreglos van a .npy para mapearlos
+ARREGLOS_ENMASCARADOS = (pd.arrays.IntegerArray, pd.arrays.FloatingArray, pd.arrays.BooleanArray)
+
+
+# Cambia cuando cambia la forma en que se escriben los archivos, los atributos de los índices
+# o el resultado de la ingesta; las carpetas de otro formato no se leen
+FORMATO = 8
+
+
+def carpeta(clave, version):
+    return os.path.join(DIRECTORIO, f"{clave}-f{FORMATO}-{'-'.join(str(v) for v in version)}")
+
+
+@contextlib.contextmanager
+def candado(clave):
+    """Candado entre procesos: solo un servidor preprocesa y escribe cada extracto"""
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    with open(os.path.join(DIRECTORIO, f"{clave}.lock"), "w") as archivo:
+        fcntl.flock(archivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(archivo, fcntl.LOCK_UN)
+
+
+class _Empacador(pickle.Pickler):
+    """Pickle de los índices que saca los arreglos grandes a archivos .npy aparte"""
+
+    def __init__(self, archivo, carpeta, datos):
+        super().__init__(archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        self._carpeta = carpeta
+        self._datos = datos
+        self._arreglos = 0
+
+    def persistent_id(self, obj):
+        if obj is self._datos:
+            return ("datos",)
+        if type(obj) is np.ndarray and not obj.dtype.hasobject and obj.nbytes >= BYTES_MINIMOS_MMAP:
+            nombre = f"arreglo_{self._arreglos}.npy"
+            self._arreglos += 1
+            np.save(os.path.join(self._carpeta, nombre), np.ascontiguousarray(obj))
+            return ("npy", nombre)
+        return None
+
+
+class _Desempacador(pickle.Unpickler):
+    def __init__(self, archivo, carpeta, datos):
+        super().__init__(archivo)
+        self._carpeta = carpeta
+        self._datos = datos
+
+    def persistent_load(self, pid):
+        if pid[0] == "datos":
+            return self._datos
+        # Páginas de solo lectura compartidas entre procesos
+        return np.load(os.path.join(self._carpeta, pid[1]), mmap_mode="r").view(np.ndarray)
+
+
+def _columnas_npy(carpeta, datos):
+    """Guarda en .npy los códigos de las categóricas y los valores y máscaras de los enteros con nulos.
+
+    Regresa la descripción de cada columna en orden; las demás se dejan a Feather.
+    """
+    columnas = []
+    for i, nombre in enumerate(datos.columns):
+        arreglo = datos[nombre].array
+        if isinstance(arreglo, pd.Categorical):
+            np.save(os.path.join(carpeta, f"columna_{i}.npy"), arreglo.codes)
+            columnas.append((nombre, "categorica", arreglo.categories))
+        elif isinstance(arreglo, ARREGLOS_ENMASCARADOS):
+            np.save(os.path.join(carpeta, f"columna_{i}.npy"), arreglo._data)
+            np.save(os.path.join(carpeta, f"columna_{i}_mascara.npy"), arreglo._mask)
+            columnas.append((nombre, "enmascarada", type(arreglo)))
+        else:
+            columnas.append((nombre, "feather", None))
+    return columnas
+
+
+def _leer_columnas(carpeta, columnas, tabla):
+    """Arma los datos con las columnas de Feather y las de .npy, todas sobre archivos mapeados"""
+    # split_blocks evita consolidar columnas: las de Feather quedan sobre el archivo mapeado
+    base = tabla.to_pandas(split_blocks=True)
+    series = {}
+    for i, (nombre, tipo, extra) in enumerate(columnas):
+        if tipo == "feather":
+            series[nombre] = base[nombre]
+            continue
+        valores = np.load(os.path.join(carpeta, f"columna_{i}.npy"), mmap_mode="r").view(np.ndarray)
+        if tipo == "categorica":
+            arreglo = pd.Categorical.from_codes(valores, categories=extra, validate=False)
+        else:
+            mascara = np.load(os.path.join(carpeta, f"columna_{i}_mascara.npy"), mmap_mode="r").view(np.ndarray)
+            arreglo = extra(valores, mascara)
+        series[nombre] = pd.Series(arreglo, index=base.index, copy=False)
+    # copy=False: un DataFrame armado desde un dict copia sus columnas por omisión
+    return pd.DataFrame(series, index=base.index, copy=False)
+
+
+def guardar(clave, version, datos, cuarentena, calidad, derivados):
+    """Escribe datos e índices de un snapshot; se publica con un solo rename atómico"""
+    destino = carpeta(clave, version)
+    if os.path.isdir(destino):
+        return destino
+    os.makedirs(DIRECTORIO, exist_ok=True)
+    temporal = tempfile.mkdtemp(prefix=f".{clave}-", dir=DIRECTORIO)
+    try:
+        columnas = _columnas_npy(temporal, datos)
+        en_feather = [nombre for nombre, tipo, _ in columnas if tipo == "feather"]
+        # Sin compresión para que las columnas se puedan mapear directo desde el archivo
+        feather.write_feather(Table.from_pandas(datos[en_feather]), os.path.join(temporal, "datos.feather"), compression="uncompressed")
+        # La descripción de columnas va aparte: los índices se desempacan ya enlazados con los datos
+        with open(os.path.join(temporal, "columnas.pkl"), "wb") as archivo:
+            pickle.dump(columnas, archivo, protocol=pickle.HIGHEST_PROTOCOL)
+        estado = {"cuarentena": cuarentena, "calidad": calidad, "derivados": derivados}
+        with open(os.path.join(temporal, "snapshot.pkl"), "wb") as archivo:
+            _Empacador(archivo, temporal, datos).dump(estado)
+        os.rename(temporal, destino)
+    except BaseException:
+        shutil.rmtree(temporal, ignore_errors=True)
+        raise
+    return destino
+
+
+def cargar(clave, version):
+    """Regresa `(datos, cuarentena, calidad, derivados)` si el snapshot ya está escrito, si no None"""
+    origen = carpeta(clave, version)
+    if not os.path.isdir(origen):
+        return None
+    tabla = feather.read_table(os.path.join(origen, "datos.feather"), memory_map=True)
+    with open(os.path.join(origen, "columnas.pkl"), "rb") as archivo:
+        datos = _leer_columnas(origen, pickle.load(archivo), tabla)
+    with open(os.path.join(origen, "snapshot.pkl"), "rb") as archivo:
+        estado = _Desempacador(archivo, origen, datos).load()
+    return datos, estado["cuarentena"], estado["calidad"], estado["derivados"]
+
+
+def limpiar(clave, version):
+    """Borra las versiones anteriores de un extracto (los procesos que aún las mapean no se ven afectados)"""
+    vigente = os.path.basename(carpeta(clave, version))
+    for nombre in os.listdir(DIRECTORIO):
+        if nombre != vigente and nombre.lstrip(".").startswith(f"{clave}-"):
+            shutil.rmtree(os.path.join(DIRECTORIO, nombre), ignore_errors=True)
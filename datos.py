@@ -0,0 +1,269 @@
+import functools
+import logging
+import os
+import threading
+import zipfile
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+import compartido
+from calidad import VALOR_VACIO, validar
+from comparacion import AlmacenPeriodos
+from distribucion import SketchesArea
+from facetas import IndiceFacetas
+from modelo import ModeloEstrella
+from muestreo import MuestraEstratificada
+from normalizacion import canonizar
+from recarga import Recargador
+from tabla_detalle import IndiceBusqueda
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- Extractos de bitácoras disponibles ---
+FUENTES = {
+    "2025_T2": {
+        "nombre": "2012 – 2do Trimestre 2025",
+        "archivo_zip": "Archivos.2.zip",
+        "nombre_csv": "Datos_Historicos_cuenta_actualizacion_23_24_30052025.2.csv",
+        "mensaje": "Información basada en e-Agrology. Bitácoras agronómicas configuradas durante el año 2012 al 2do Trimestre 2025 ",
+    },
+    "2025_T1": {
+        "nombre": "2012 – 1er Trimestre 2025",
+        "archivo_zip": "Archivos.zip",
+        "nombre_csv": "Datos_Historicos_cuenta_actualizacion 23_24 _30052025.csv",
+        "mensaje": "Información basada en e-A. Bitácoras agronómicas 2012_1er Trimestre 2025 ",
+    },
+}
+FUENTE_PREDETERMINADA = "2025_T2"
+
+# --- Polígonos de los HUBs (WGS84) ---
+ARCHIVO_HUBS = "HUBs.parquet"
+
+# --- Columnas que todo extracto debe traer ---
+COLUMNAS_REQUERIDAS = [
+    "Anio", "Categoria_Proyecto", "Ciclo", "Estado",
+    "Tipo_Regimen_Hidrico", "Tipo_parcela", "Area_total_de_la_parcela(ha)", "Proyecto"
+]
+
+# --- Columnas adicionales que se preprocesan cuando el extracto las trae ---
+COLUMNAS_OPCIONALES = [
+    "Id_Parcela(Unico)", "Id_Productor", "Genero", "Latitud", "Longitud",
+    "Cultivo(s)", "Tipo de sistema", "HUB_Agroecológico"
+]
+
+# --- Columnas numéricas: se convierten en la ingesta y se validan en calidad.py ---
+COLUMNAS_NUMERICAS = ["Anio", "Area_total_de_la_parcela(ha)", "Latitud", "Longitud"]
+
+COLUMNAS_CATEGORICAS = ["Categoria_Proyecto", "Ciclo", "Estado", "Tipo_Regimen_Hidrico", "Tipo_parcela", "Proyecto"]
+
+ANIO_MINIMO = 2012
+ANIO_MAXIMO = 2025
+
+
+def leer_fuente(clave):
+    """Lee el CSV de un extracto directamente desde su ZIP"""
+    fuente = FUENTES[clave]
+    with zipfile.ZipFile(fuente["archivo_zip"], 'r') as z:
+        with z.open(fuente["nombre_csv"]) as f:
+            return pd.read_csv(f)
+
+
+def preprocesar(datos):
+    """Limpieza común a todos los tableros; se ejecuta una sola vez por extracto.
+
+    Regresa `(limpios, cuarentena, resumen_calidad)`: las columnas numéricas quedan
+    convertidas en los datos limpios, así que las vistas no vuelven a coercionar nada.
+    """
+    for columna in COLUMNAS_REQUERIDAS:
+        if columna not in datos.columns:
+            raise ValueError(f"La columna '{columna}' no existe en el archivo CSV.")
+
+    for columna in COLUMNAS_REQUERIDAS + [c for c in COLUMNAS_OPCIONALES if c in datos.columns]:
+        if columna not in COLUMNAS_NUMERICAS:
+            # Con pandas 3 el texto del CSV llega como dtype "str", no "object"
+            datos[columna] = datos[columna].fillna(0 if pd.api.types.is_numeric_dtype(datos[columna]) else VALOR_VACIO)
+
+    for col in COLUMNAS_CATEGORICAS:
+        datos[col] = datos[col].astype(str)
+
+    datos["Anio"] = pd.to_numeric(datos["Anio"], errors="coerce")
+
+    # Área vacía cuenta como 0 ha; un texto no numérico queda como NaN para la validación
+    area = datos["Area_total_de_la_parcela(ha)"]
+    datos["Area_total_de_la_parcela(ha)"] = pd.to_numeric(area, errors="coerce").where(area.notna(), 0)
+
+    if {"Latitud", "Longitud"}.issubset(datos.columns):
+        datos["Latitud"] = pd.to_numeric(datos["Latitud"], errors="coerce")
+        datos["Longitud"] = pd.to_numeric(datos["Longitud"], errors="coerce")
+        # (0, 0) es la forma en que la captura deja las coordenadas vacías
+        vacias = (datos["Latitud"] == 0) & (datos["Longitud"] == 0)
+        datos.loc[vacias, ["Latitud", "Longitud"]] = np.nan
+
+    # Variantes como "Maiz"/"Maíz" se unifican antes de validar estados y de indexar
+    canonizar(datos)
+
+    limpios, cuarentena, resumen = validar(datos, ANIO_MINIMO, ANIO_MAXIMO)
+    limpios = limpios.copy()
+    limpios["Anio"] = limpios["Anio"].astype("Int64")
+    return limpios, cuarentena, resumen
+
+
+def derivado(funcion):
+    """Estructura derivada de un snapshot: se calcula una vez y la comparten todas las sesiones"""
+    nombre = funcion.__name__
+
+    @property
+    @functools.wraps(funcion)
+    def propiedad(self):
+        with self._candado:
+            if nombre not in self._derivados:
+                self._derivados[nombre] = funcion(self)
+            return self._derivados[nombre]
+
+    return propiedad
+
+
+class Snapshot:
+    """Datos preprocesados de un extracto junto con sus índices derivados.
+
+    Un snapshot es de solo lectura: las vistas filtran copias y nunca modifican `datos`.
+    Cada ejecución de la app toma el snapshot activo una sola vez, así que una recarga
+    en segundo plano solo se ve a partir de la siguiente ejecución de cada sesión.
+    """
+
+    def __init__(self, clave, version, datos, cuarentena=None, calidad=None, derivados=None):
+        self.clave = clave
+        self.version = version
+        self.datos = datos
+        self.cuarentena = cuarentena
+        self.calidad = calidad
+        self._candado = threading.RLock()
+        self._derivados = dict(derivados or {})
+
+    @property
+    def fuente(self):
+        return FUENTES[self.clave]
+
+    def preparar(self):
+        """Construye las estructuras derivadas que usan todas las páginas.
+
+        El índice espacial y la cobertura de los HUBs no se incluyen: necesitan
+        scikit-learn y geopandas, y se construyen la primera vez que una página de
+        mapas los pide.
+        """
+        derivados = [
+            "cuarentena_csv", "indice_busqueda", "indice_facetas", "modelo_estrella",
+            "almacen_periodos", "sketches_area", "muestra_estratificada",
+        ]
+        for nombre in derivados:
+            getattr(self, nombre)
+        return self
+
+    @derivado
+    def cuarentena_csv(self):
+        return self.cuarentena.to_csv(index=False).encode("utf-8")
+
+    @derivado
+    def indice_busqueda(self):
+        return IndiceBusqueda(self.datos)
+
+    @derivado
+    def indice_facetas(self):
+        return IndiceFacetas(self.datos)
+
+    @derivado
+    def almacen_periodos(self):
+        return AlmacenPeriodos(self.modelo_estrella)
+
+    @derivado
+    def sketches_area(self):
+        return SketchesArea(self.datos, self.indice_facetas)
+
+    @derivado
+    def muestra_estratificada(self):
+        return MuestraEstratificada(self.datos, self.indice_facetas)
+
+    @derivado
+    def modelo_estrella(self):
+        return ModeloEstrella(self.datos, self.indice_facetas)
+
+    @derivado
+    def indice_espacial(self):
+        # scikit-learn solo se importa cuando alguna página usa el índice espacial
+        from proximidad import IndiceEspacial
+        return IndiceEspacial(self.datos)
+
+    @derivado
+    def cobertura_hubs(self):
+        # geopandas solo se importa cuando alguna página usa las geometrías
+        from cobertura import CoberturaHubs, leer_hubs
+        return CoberturaHubs(self.modelo_estrella, leer_hubs())
+
+
+def version_fuente(clave):
+    """Identifica el contenido actual del ZIP de un extracto y de las geometrías de los HUBs"""
+    estado = os.stat(FUENTES[clave]["archivo_zip"])
+    geometrias = os.stat(ARCHIVO_HUBS).st_mtime_ns if os.path.exists(ARCHIVO_HUBS) else 0
+    return (estado.st_mtime_ns, estado.st_size, geometrias)
+
+
+def construir_snapshot(clave, version):
+    """Lee, limpia e indexa un extracto completo antes de publicarlo.
+
+    El resultado se escribe una sola vez en disco (Feather + arreglos .npy) y los demás
+    procesos del servidor lo abren con mmap en lugar de volver a preprocesarlo, de modo
+    que comparten la memoria física de las columnas numéricas y de los índices.
+    """
+    guardado = compartido.cargar(clave, version)
+    if guardado is None:
+        with compartido.candado(clave):
+            # Otro proceso pudo terminar de escribirlo mientras se esperaba el candado
+            guardado = compartido.cargar(clave, version)
+            if guardado is None:
+                datos, cuarentena, calidad = preprocesar(leer_fuente(clave))
+                snapshot = Snapshot(clave, version, datos, cuarentena, calidad).preparar()
+                try:
+                    compartido.guardar(clave, version, datos, cuarentena, calidad, snapshot._derivados)
+                except compartido.ERRORES_ESCRITURA:
+                    # Sin copia compartida este proceso sigue con la suya; los demás la construirán igual
+                    logger.exception("No se pudo escribir el snapshot compartido de %s", clave)
+                    return snapshot
+                compartido.limpiar(clave, version)
+                # También quien lo construyó trabaja sobre la copia mapeada y libera la suya
+                guardado = compartido.cargar(clave, version)
+    datos, cuarentena, calidad, derivados = guardado
+    return Snapshot(clave, version, datos, cuarentena, calidad, derivados).preparar()
+
+
+@st.cache_resource(show_spinner=False)
+def _recargador():
+    # Un solo recargador por servidor; arranca precalentando todos los extractos
+    return Recargador(version_fuente, construir_snapshot, claves=FUENTES).iniciar()
+
+
+def obtener_snapshot(clave=FUENTE_PREDETERMINADA):
+    """Snapshot activo del extracto; se comparte entre sesiones y se actualiza en segundo plano"""
+    return _recargador().activo(clave)
+
+
+def cargar_o_detener(clave=FUENTE_PREDETERMINADA):
+    """Obtiene el snapshot o muestra el error correspondiente y detiene la ejecución"""
+    fuente = FUENTES[clave]
+    try:
+        with st.spinner("Cargando bitácoras..."):
+            snapshot = obtener_snapshot(clave)
+    except FileNotFoundError:
+        st.error(f"Error: El archivo '{fuente['archivo_zip']}' no se encontró.")
+        st.stop()
+    except KeyError:
+        st.error(f"Error: El archivo '{fuente['nombre_csv']}' no está dentro del ZIP.")
+        st.stop()
+    except ValueError as error:
+        st.error(str(error))
+        st.stop()
+    st.success(fuente["mensaje"])
+    return snapshot
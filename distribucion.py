@@ -0,0 +1,116 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+
+COLUMNA_AREA = "Area_total_de_la_parcela(ha)"
+
+# --- Error relativo garantizado de los cuantiles aproximados ---
+PRECISION_RELATIVA = 0.01
+GAMMA = (1 + PRECISION_RELATIVA) / (1 - PRECISION_RELATIVA)
+
+# --- Rango de áreas representable: de 0.0001 ha a 100,000 ha ---
+AREA_MINIMA = 1e-4
+AREA_MAXIMA = 1e5
+
+
+def _cubeta(valor):
+    return math.ceil(math.log(valor) / math.log(GAMMA))
+
+
+CUBETA_MINIMA = _cubeta(AREA_MINIMA)
+N_CUBETAS = _cubeta(AREA_MAXIMA) - CUBETA_MINIMA + 2  # la cubeta 0 guarda las áreas de 0 ha
+
+
+class SketchesArea:
+    """Sketches de cuantiles mergeables del área de parcela por celda del cubo de facetas.
+
+    Cada sketch es un histograma de cubetas logarítmicas (esquema DDSketch): cualquier
+    cuantil que se obtenga de él tiene un error relativo menor a PRECISION_RELATIVA, y
+    fusionar sketches es sumar conteos. Se guarda un sketch disperso por combinación
+    del índice de facetas, así que cualquier selección de filtros se responde sumando
+    las celdas seleccionadas, sin tocar las filas.
+    """
+
+    def __init__(self, datos, indice_facetas):
+        self.indice = indice_facetas
+        area = datos[COLUMNA_AREA].to_numpy(dtype=np.float64)
+        cubetas = np.zeros(len(area), dtype=np.int64)
+        positivas = area > 0
+        cubetas[positivas] = np.ceil(
+            np.log(np.clip(area[positivas], AREA_MINIMA, AREA_MAXIMA)) / np.log(GAMMA)
+        ).astype(np.int64) - CUBETA_MINIMA + 1
+
+        llaves, conteos = np.unique(indice_facetas.combinacion_fila.astype(np.int64) * N_CUBETAS + cubetas, return_counts=True)
+        self.celda = llaves // N_CUBETAS
+        self.cubeta = llaves % N_CUBETAS
+        self.conteos = conteos
+
+    def fusionar(self, mascara, grupo=None):
+        """Suma los sketches de las celdas seleccionadas; con `grupo` regresa uno por valor de esa faceta"""
+        seleccion = mascara[self.celda]
+        cubetas = self.cubeta[seleccion]
+        conteos = self.conteos[seleccion]
+        if grupo is None:
+            return {"Total": np.bincount(cubetas, weights=conteos, minlength=N_CUBETAS)}
+
+        codigos = self.indice.cubo[grupo][self.celda[seleccion]]
+        n_valores = len(self.indice.valores[grupo])
+        matriz = np.bincount(codigos * N_CUBETAS + cubetas, weights=conteos, minlength=n_valores * N_CUBETAS)
+        matriz = matriz.reshape(n_valores, N_CUBETAS)
+        return {
+            self.indice.valores[grupo][i]: matriz[i]
+            for i in np.flatnonzero(matriz.sum(axis=1))
+        }
+
+
+def valor_cubeta(cubetas):
+    """Valor representativo de cada cubeta (punto medio relativo del intervalo)"""
+    cubetas = np.asarray(cubetas)
+    exponente = cubetas + CUBETA_MINIMA - 1
+    return np.where(cubetas == 0, 0.0, 2 * GAMMA ** exponente / (GAMMA + 1))
+
+
+def cuantiles(sketch, probabilidades):
+    """Cuantiles aproximados de un sketch fusionado"""
+    acumulado = np.cumsum(sketch)
+    total = acumulado[-1]
+    if total == 0:
+        return np.full(len(probabilidades), np.nan)
+    rangos = np.asarray(probabilidades) * (total - 1)
+    return valor_cubeta(np.searchsorted(acumulado, rangos, side="right"))
+
+
+def histograma(sketch, cubetas_por_barra=12):
+    """Histograma del sketch agrupando cubetas contiguas en barras de ancho logarítmico"""
+    cubetas = np.flatnonzero(sketch)
+    if not len(cubetas):
+        return pd.DataFrame(columns=["Desde (ha)", "Hasta (ha)", "Bitácoras"])
+    barra = np.where(cubetas == 0, -1, (cubetas - 1) // cubetas_por_barra)
+    tabla = pd.DataFrame({"barra": barra, "Bitácoras": sketch[cubetas]}).groupby("barra", as_index=False)["Bitácoras"].sum()
+    inicio = tabla["barra"] * cubetas_por_barra + CUBETA_MINIMA - 1
+    tabla["Desde (ha)"] = np.where(tabla["barra"] < 0, 0.0, GAMMA ** inicio)
+    tabla["Hasta (ha)"] = np.where(tabla["barra"] < 0, 0.0, GAMMA ** (inicio + cubetas_por_barra))
+    return tabla[["Desde (ha)", "Hasta (ha)", "Bitácoras"]]
+
+
+def resumen_cuantiles(sketches, probabilidades=(0.25, 0.5, 0.9)):
+    """Tabla con número de bitácoras y cuantiles por grupo"""
+    filas = []
+    for grupo, sketch in sketches.items():
+        valores = cuantiles(sketch, probabilidades)
+        fila = {"Grupo": grupo, "Bitácoras": int(sketch.sum())}
+        fila.update({f"p{int(p * 100)} (ha)": v for p, v in zip(probabilidades, valores)})
+        filas.append(fila)
+    return pd.DataFrame(filas)
+
+
+def resumen_exacto(datos_filtrados, grupo=None, probabilidades=(0.25, 0.5, 0.9)):
+    """Mismos cuantiles calculados sobre las filas, para comparar con la aproximación"""
+    area = datos_filtrados[COLUMNA_AREA]
+    agrupado = area.groupby(datos_filtrados[grupo], observed=True) if grupo else area.groupby(lambda _: "Total")
+    tabla = agrupado.quantile(list(probabilidades)).unstack()
+    tabla.columns = [f"p{int(p * 100)} (ha)" for p in probabilidades]
+    tabla.insert(0, "Bitácoras", agrupado.size())
+    return tabla.rename_axis("Grupo").reset_index()
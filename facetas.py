@@ -0,0 +1,75 @@
+import numpy as np
+import pandas as pd
+
+from catalogos import OPCIONES_CULTIVO, clasificar_cultivo_multiple, mascara_cultivo
+
+
+# --- Facetas de los filtros encadenados, en el orden en que se aplican ---
+FACETAS = [
+    "Anio", "HUB_Agroecológico", "Categoria_Proyecto", "Proyecto",
+    "Ciclo", "Tipo_parcela", "Estado", "Tipo de sistema"
+]
+FACETA_CULTIVO = "Cultivo(s)"
+
+
+class IndiceFacetas:
+    """Cubo de co-ocurrencias de las facetas para calcular opciones y conteos sin recorrer filas.
+
+    Cada fila se reduce a la combinación de códigos de sus facetas; el cubo guarda una
+    fila por combinación distinta con su número de bitácoras. Las opciones de un filtro,
+    dada la selección de los filtros anteriores, se obtienen sumando sobre el cubo.
+    """
+
+    def __init__(self, datos, facetas=FACETAS):
+        self.facetas = [f for f in facetas if f in datos.columns]
+        self.valores = {}
+        codigos = {}
+        for col in self.facetas:
+            codigos[col], self.valores[col] = pd.factorize(datos[col], sort=True)
+
+        if FACETA_CULTIVO in datos.columns:
+            # La clasificación de cultivos se hace sobre los valores distintos
+            codigos_cultivo, textos = pd.factorize(datos[FACETA_CULTIVO])
+            bits = np.array([mascara_cultivo(clasificar_cultivo_multiple(t)) for t in textos], dtype=np.uint8)
+            codigos[FACETA_CULTIVO] = bits[codigos_cultivo]
+            self.valores[FACETA_CULTIVO] = pd.Index(OPCIONES_CULTIVO)
+
+        columnas = list(codigos)
+        agrupado = pd.DataFrame(codigos).groupby(columnas, sort=False)
+        self.combinacion_fila = agrupado.ngroup().to_numpy(dtype=np.int32)
+        cubo = agrupado.size().reset_index(name="Bitácoras")
+        self.cubo = {col: cubo[col].to_numpy() for col in columnas}
+        self.conteos = cubo["Bitácoras"].to_numpy(dtype=np.int64)
+
+    def __len__(self):
+        return len(self.conteos)
+
+    def mascara(self, selecciones):
+        """Combinaciones del cubo que cumplen con todas las selecciones no vacías"""
+        mascara = np.ones(len(self), dtype=bool)
+        for col, seleccion in selecciones.items():
+            if not seleccion or col not in self.cubo:
+                continue
+            if col == FACETA_CULTIVO:
+                bits = mascara_cultivo(seleccion)
+                mascara &= (self.cubo[col] & bits) != 0
+            else:
+                posiciones = self.valores[col].get_indexer(list(seleccion))
+                elegidos = np.zeros(len(self.valores[col]), dtype=bool)
+                elegidos[posiciones[posiciones >= 0]] = True
+                mascara &= elegidos[self.cubo[col]]
+        return mascara
+
+    def opciones(self, col, mascara):
+        """Valores disponibles de una faceta y sus bitácoras dentro de la máscara del cubo"""
+        if col == FACETA_CULTIVO:
+            bits = self.cubo[col][mascara]
+            conteos = np.array([self.conteos[mascara][(bits & (1 << i)) != 0].sum() for i in range(len(OPCIONES_CULTIVO))])
+            return list(OPCIONES_CULTIVO), conteos
+        conteos = np.bincount(self.cubo[col][mascara], weights=self.conteos[mascara], minlength=len(self.valores[col]))
+        presentes = np.flatnonzero(conteos)
+        return list(self.valores[col][presentes]), conteos[presentes].astype(np.int64)
+
+    def filas(self, mascara):
+        """Máscara booleana de filas a partir de una máscara del cubo"""
+        return mascara[self.combinacion_fila]
@@ -0,0 +1,283 @@
+import html
+
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from catalogos import centros_estados
+
+
+# --- Estilo de mapa base: "carto-positron" descarga teselas; "white-bg" no necesita red ---
+ESTILO_MAPA = "carto-positron"
+ESTILO_SIN_RED = "white-bg"
+
+colores_parcela_dict = {
+    "Área de Impacto": "#87CEEB",
+    "Área de extensión": "#2ca02c",
+    "Módulo": "#d62728"
+}
+
+# --- --- --- Paleta de colores RGB para HUBs --- --- --- #
+hub_color_dict = {
+    "HUB 0": "rgb(220,220,220)",
+    "HUB 1": "rgb(227,111,30)",
+    "HUB 2": "rgb(171,6,52)",
+    "HUB 3": "rgb(253,185,19)",
+    "HUB 4": "rgb(44,175,164)",
+    "HUB 5": "rgb(0,79,90)",
+    "HUB 6": "rgb(194,72,54)",
+    "HUB 7": "rgb(91,155,152)",
+    "HUB 8": "rgb(80,145,205)",
+    "HUB 9": "rgb(82,78,134)",
+    "HUB 10": "rgb(221,117,174)",
+    "HUB 11": "rgb(139,140,53)",
+    "HUB 12": "rgb(0,178,89)"
+}
+
+# --- --- --- Diccionario de nombres para leyenda --- --- --- #
+nombre_leyenda_dict = {
+    "HUB 0": "0._HUB TBD",
+    "HUB 1": "1._HUB BAJ",
+    "HUB 2": "2._HUB CHIA",
+    "HUB 3": "3._HUB EINT",
+    "HUB 4": "4._HUB GCTO",
+    "HUB 5": "5._HUB INGP",
+    "HUB 6": "6._HUB OCC",
+    "HUB 7": "7._HUB PCTO",
+    "HUB 8": "8._HUB PAC",
+    "HUB 9": "9._HUB PSUR",
+    "HUB 10": "10._HUB YUC",
+    "HUB 11": "11._HUB VAGP",
+    "HUB 12": "12._HUB VAM",
+}
+
+
+def muestrear_puntos(df, max_puntos=5000):
+    if len(df) > max_puntos:
+        return df.sample(n=max_puntos, random_state=1)
+    return df
+
+
+# --- Carga útil de las figuras: coordenadas como arreglos float32 (Plotly los manda en base64) ---
+# Las combinaciones de cultivos más frecuentes van en su propia traza con hover fijo;
+# el resto comparte una traza con el texto por punto.
+MAXIMO_TRAZAS_CULTIVO = 20
+
+
+def _arreglo(valores, tipo=np.float32):
+    return np.asarray(valores, dtype=tipo)
+
+
+def _cultivos_unicos(cultivos):
+    # Orden fijo para que la misma combinación siempre tenga el mismo texto
+    return ", ".join(sorted(str(i) for i in cultivos.dropna().unique()))
+
+
+# --- --- --- Función para crear figura de parcelas --- --- --- #
+def crear_figura(datos_filtrados, zoom=4, estilo=ESTILO_MAPA):
+    datos_geo_filtrado = datos_filtrados.dropna(subset=["Latitud", "Longitud"]).copy()
+    datos_geo_filtrado["Latitud_r"] = datos_geo_filtrado["Latitud"].round(4)
+    datos_geo_filtrado["Longitud_r"] = datos_geo_filtrado["Longitud"].round(4)
+
+    parcelas_geo = (
+        datos_geo_filtrado.groupby(["Latitud_r", "Longitud_r", "Tipo_parcela"], observed=True)
+        .agg(
+            Parcelas=("Id_Parcela(Unico)", "nunique"),
+            Cultivos_unicos=("Cultivo(s)", _cultivos_unicos)
+        )
+        .reset_index()
+        .rename(columns={"Latitud_r": "Latitud", "Longitud_r": "Longitud", "Cultivos_unicos": "Cultivo(s)"})
+    )
+
+    parcelas_geo = muestrear_puntos(parcelas_geo, max_puntos=5000)
+    # Plotly interpreta "<" y "&" como su pseudo-HTML; los nombres de cultivo van escapados
+    parcelas_geo["Cultivo(s)"] = parcelas_geo["Cultivo(s)"].map(html.escape)
+
+    fig = go.Figure()
+    for tipo, color in colores_parcela_dict.items():
+        df_tipo = parcelas_geo[parcelas_geo["Tipo_parcela"] == tipo]
+        if df_tipo.empty:
+            continue
+        tamanios = _arreglo(np.clip(df_tipo["Parcelas"] * 2, 5, 25) * (zoom / 4))
+        frecuentes = df_tipo["Cultivo(s)"].value_counts().index[:MAXIMO_TRAZAS_CULTIVO]
+        grupos = [(c, (df_tipo["Cultivo(s)"] == c).to_numpy()) for c in frecuentes]
+        resto = ~df_tipo["Cultivo(s)"].isin(frecuentes).to_numpy()
+        if resto.any():
+            grupos.append((None, resto))
+
+        # Todas las trazas de un tipo comparten entrada de leyenda
+        for i, (cultivos, puntos) in enumerate(grupos):
+            fig.add_trace(go.Scattermapbox(
+                lat=_arreglo(df_tipo["Latitud"].to_numpy()[puntos]),
+                lon=_arreglo(df_tipo["Longitud"].to_numpy()[puntos]),
+                mode="markers",
+                marker=dict(size=tamanios[puntos], sizemode="area", color=color),
+                text=df_tipo["Cultivo(s)"].to_numpy()[puntos] if cultivos is None else None,
+                # El texto fijo va en `meta`: así un "%{" en un cultivo nunca se lee como plantilla
+                meta=cultivos,
+                hovertemplate=f"<b>{'%{text}' if cultivos is None else '%{meta}'}</b><extra></extra>",
+                name=tipo,
+                legendgroup=tipo,
+                showlegend=i == 0
+            ))
+
+    fig.update_layout(
+        mapbox=dict(center={"lat": 23.0, "lon": -102.0}, zoom=zoom, style=estilo),
+        margin={"l":0,"r":0,"t":50,"b":0},
+        height=700,
+        width=900,
+        title="📍 Distribución de Parcelas Atendidas",
+        legend=dict(
+            title="Tipo de Parcela",
+            orientation="v",
+            x=1.05,
+            y=1,
+            xanchor="left",
+            yanchor="top",
+            bgcolor="rgba(255,255,255,0.7)",
+            bordercolor="black",
+            borderwidth=1
+        )
+    )
+    return fig
+
+
+def _contornos(geom):
+    """Anillos exteriores de un (Multi)Polygon en un solo par de arreglos, separados por NaN"""
+    geoms = [geom] if geom.geom_type == "Polygon" else geom.geoms
+    anillos = [np.asarray(poly.exterior.coords)[:, :2] for poly in geoms]
+    separados = np.concatenate([np.vstack([a, [[np.nan, np.nan]]]) for a in anillos])[:-1]
+    return _arreglo(separados[:, 0]), _arreglo(separados[:, 1])
+
+
+# --- --- --- Agregar polígonos HUBs al mapa --- --- --- #
+def agregar_hubs(fig, hubs_to_plot, transparencia=0.05):
+    # Una traza por HUB: sus polígonos van juntos, separados por NaN
+    for nombre, geom in zip(hubs_to_plot["Nombre"], hubs_to_plot.geometry):
+        lon, lat = _contornos(geom)
+        color_rgb = hub_color_dict[nombre]
+        fig.add_trace(go.Scattermapbox(
+            lat=lat,
+            lon=lon,
+            mode="lines",
+            fill="toself",
+            fillcolor=color_rgb.replace("rgb", "rgba").replace(")", f",{transparencia})"),
+            line=dict(color=color_rgb, width=2),
+            name=nombre_leyenda_dict.get(nombre, f"HU {nombre}"),
+            hovertext=f"HUB: {nombre}",
+            hoverinfo="text"
+        ))
+    return fig
+
+
+def figura_estados(datos_filtrados, estilo=ESTILO_MAPA):
+    """Mapa de burbujas con el número de parcelas por estado"""
+    # --- Crear DataFrame con número de parcelas por estado según el filtro activo ---
+    parcelas_estado = datos_filtrados.groupby("Estado", observed=True).agg({
+        "Id_Parcela(Unico)": "nunique"
+    }).reset_index().rename(columns={"Id_Parcela(Unico)": "Parcelas"})
+
+    # --- Agregar columnas de latitud y longitud ---
+    parcelas_estado["Latitud"] = _arreglo(parcelas_estado["Estado"].map(lambda x: centros_estados.get(x, {}).get("lat", 23.0)))
+    parcelas_estado["Longitud"] = _arreglo(parcelas_estado["Estado"].map(lambda x: centros_estados.get(x, {}).get("lon", -102.0)))
+
+    # --- Ajuste dinámico del tamaño de burbujas ---
+    max_parcelas = parcelas_estado["Parcelas"].max()
+    size_max = 40  # tamaño máximo en pixeles
+    size_min = 6   # tamaño mínimo visible
+
+    if max_parcelas > 0:
+        sizeref = (2.0 * max_parcelas) / (size_max**2)
+    else:
+        sizeref = 1  # fallback si no hay datos
+
+    # --- Crear mapa de burbujas interactivo ---
+    fig_estado = px.scatter_mapbox(
+        parcelas_estado,
+        lat="Latitud",
+        lon="Longitud",
+        size="Parcelas",
+        color="Parcelas",
+        hover_name="Estado",
+        hover_data={"Parcelas": True, "Latitud": False, "Longitud": False},
+        size_max=size_max,
+        color_continuous_scale="Plasma",
+        zoom=4.0,
+        center={"lat": 23.0, "lon": -102.0},
+        mapbox_style=estilo,
+        title="📍 Intensidad de Parcelas Atendidas por Estado"
+    )
+
+    # --- Ajuste de escala de colores ---
+    cmin = parcelas_estado["Parcelas"].min()
+    cmax = max_parcelas
+    step = max(1, (cmax - cmin) // 6)
+
+    # El color ya viaja en marker.color vía coloraxis; aquí solo se fija su rango
+    fig_estado.update_traces(
+        marker=dict(
+            sizemode="area",
+            sizeref=sizeref,   # dinámico según filtro
+            sizemin=size_min   # tamaño mínimo garantizado
+        )
+    )
+
+    # --- Layout ---
+    fig_estado.update_layout(
+        margin={"l":0,"r":0,"t":50,"b":0},
+        height=700,
+        width=900,
+        coloraxis_cmin=cmin,
+        coloraxis_cmax=cmax,
+        coloraxis_colorbar=dict(
+            title="Parcelas",
+            tickvals=list(range(cmin, cmax + step, step)),
+            ticktext=[f"{v//1000}k" for v in range(cmin, cmax + step, step)]
+        )
+    )
+    return fig_estado
+
+
+def agregar_focos(fig, puntos, resumen):
+    """Capa con las parcelas de cada foco de concentración y la etiqueta en su centro"""
+    fig.add_trace(go.Scattermapbox(
+        lat=_arreglo(puntos["Latitud"]),
+        lon=_arreglo(puntos["Longitud"]),
+        mode="markers",
+        marker=dict(size=7, color=_arreglo(puntos["Foco"], np.int32), colorscale="Turbo", opacity=0.8),
+        hovertemplate="Foco %{marker.color}<extra></extra>",
+        name="🔥 Parcelas en focos"
+    ))
+    fig.add_trace(go.Scattermapbox(
+        lat=_arreglo(resumen["Latitud"]),
+        lon=_arreglo(resumen["Longitud"]),
+        mode="markers+text",
+        marker=dict(size=12, color="black"),
+        text=[f"Foco {foco}" for foco in resumen["Foco"]],
+        textposition="top right",
+        customdata=resumen["Parcelas"],
+        hovertemplate="<b>%{text}</b><br>%{customdata} parcelas<extra></extra>",
+        name="🔥 Centro de foco"
+    ))
+    return fig
+
+
+def figura_cobertura(tabla, geojson, metrica, estilo=ESTILO_MAPA):
+    """Polígonos de los HUBs rellenos según una métrica de cobertura"""
+    fig = px.choropleth_mapbox(
+        tabla,
+        geojson=geojson,
+        locations="Nombre",
+        featureidkey="properties.Nombre",
+        color=metrica,
+        color_continuous_scale="YlGn",
+        hover_name=tabla["Nombre"].map(lambda n: nombre_leyenda_dict.get(n, n)),
+        hover_data={"Nombre": False, "Parcelas": True, "Área del polígono (ha)": ":,.0f", metrica: ":,.3f"},
+        zoom=4.0,
+        center={"lat": 23.0, "lon": -102.0},
+        opacity=0.7,
+        mapbox_style=estilo,
+        title=f"🗺️ {metrica} por HUB"
+    )
+    fig.update_layout(margin={"l": 0, "r": 0, "t": 50, "b": 0}, height=650)
+    return fig
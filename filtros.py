@@ -0,0 +1,123 @@
+import numpy as np
+import streamlit as st
+
+from facetas import FACETA_CULTIVO
+
+
+# --- Filtros encadenados: (columna, etiqueta en el sidebar, prefijo de las llaves, nombre en el resumen) ---
+FILTROS_ENCADENADOS = [
+    ("HUB_Agroecológico", "HUB Agroecológico", "hub", "HUBs Agroecológicos"),
+    ("Categoria_Proyecto", "Categoría del Proyecto", "categoria", "Categoría"),
+    ("Proyecto", "Proyecto", "proyecto", "Proyectos"),
+    ("Ciclo", "Ciclo", "ciclo", "Ciclos"),
+    ("Tipo_parcela", "Tipo de Parcela", "parcela", "Tipos de Parcela"),
+    ("Estado", "Estado", "estado", "Estados"),
+    ("Tipo de sistema", "Tipo de sistema", "sistema", "Tipo de sistema"),
+    (FACETA_CULTIVO, "Cultivo(s)", "cultivo", "Cultivo(s)"),
+]
+
+# --- Facetas con más opciones que esto usan un multiselect con búsqueda en lugar de checkboxes ---
+MAXIMO_CHECKBOXES = 12
+
+
+# --- Función para checkboxes con opción de seleccionar todos ---
+def checkbox_list(label, opciones, prefix, preseleccionadas=None):
+    """Crea un grupo de checkboxes con opción de seleccionar/deseleccionar todo"""
+    st.sidebar.markdown(f"**{label}**")
+    seleccionadas = []
+    for o in opciones:
+        default_value = o in preseleccionadas if preseleccionadas else True
+        key_name = f"{prefix}_{str(o)}"
+        if st.sidebar.checkbox(str(o), value=default_value, key=key_name):
+            seleccionadas.append(o)
+    return seleccionadas
+
+
+def multiselect_conteos(label, opciones, conteos, prefix):
+    """Multiselect con búsqueda para facetas largas; vacío equivale a todos"""
+    key_name = f"{prefix}_multiselect"
+    if key_name in st.session_state:
+        # Se descartan los valores que ya no existen con la selección de los filtros anteriores
+        disponibles = set(opciones)
+        st.session_state[key_name] = [o for o in st.session_state[key_name] if o in disponibles]
+    conteo_por_opcion = dict(zip(opciones, conteos))
+    return st.sidebar.multiselect(
+        f"**{label}**",
+        opciones,
+        key=key_name,
+        placeholder=f"Todos ({len(opciones):,}) · escribe para buscar",
+        format_func=lambda o: f"{o} ({conteo_por_opcion[o]:,})"
+    )
+
+
+def mostrar_filtros(snapshot):
+    """Dibuja el sidebar de filtros encadenados y regresa los datos filtrados con cada selección.
+
+    Las opciones y sus conteos salen del índice de facetas del snapshot; las filas solo
+    se recorren una vez, al final, para obtener los datos filtrados. También se regresa
+    la máscara sobre el cubo de facetas para las estructuras precalculadas por celda.
+    """
+    indice = snapshot.indice_facetas
+    st.sidebar.header(" 🔽 Filtros")
+    selecciones = {}
+
+    # --- Preselección de años (últimos 2 años) ---
+    opciones_anio, _ = indice.opciones("Anio", indice.mascara({}))
+    ultimos_anos = opciones_anio[-2:]
+    seleccion_anio = checkbox_list("Año", opciones_anio, "anio", preseleccionadas=ultimos_anos)
+    selecciones["Anio"] = ("Años", seleccion_anio, opciones_anio)
+    # Sin años seleccionados no queda ninguna bitácora
+    mascara = indice.mascara({"Anio": seleccion_anio}) if seleccion_anio else np.zeros(len(indice), dtype=bool)
+
+    for columna, etiqueta, prefijo, nombre in FILTROS_ENCADENADOS:
+        if columna not in indice.cubo:
+            continue
+        opciones, conteos = indice.opciones(columna, mascara)
+        if len(opciones) > MAXIMO_CHECKBOXES:
+            seleccion = multiselect_conteos(etiqueta, opciones, conteos, prefijo)
+        else:
+            seleccion = checkbox_list(etiqueta, opciones, prefijo)
+        if seleccion:
+            mascara &= indice.mascara({columna: seleccion})
+        selecciones[columna] = (nombre, seleccion, opciones)
+
+    datos_filtrados = snapshot.datos[indice.filas(mascara)]
+    return datos_filtrados, selecciones, mascara
+
+
+def mostrar_resumen_filtros(selecciones):
+    """Resumen en texto de los filtros aplicados"""
+    st.markdown("### Filtros Aplicados")
+    filtros_texto = []
+    for nombre, seleccion, opciones in selecciones.values():
+        if not seleccion:  # Si no hay selección => Todos
+            filtros_texto.append(f"**{nombre}:** Todos")
+        elif set(seleccion) == set(opciones):  # Si seleccionó todo => Todos
+            filtros_texto.append(f"**{nombre}:** Todos")
+        else:
+            filtros_texto.append(f"**{nombre}:** {', '.join(str(s) for s in seleccion)}")
+
+    st.markdown(",  ".join(filtros_texto) if filtros_texto else "No se aplicaron filtros, se muestran todos los datos.")
+
+
+def vista_actual():
+    """Snapshot y selección calculados por la página principal en esta ejecución.
+
+    `vista["clave_filtro"]` identifica el estado de los filtros; es la llave de caché
+    que usan todas las páginas para sus cálculos por selección.
+    """
+    return st.session_state["vista"]
+
+
+def mascara_sin_faceta(vista, columna):
+    """Máscara del cubo con las selecciones del sidebar excepto la de `columna`.
+
+    Una faceta con todas sus opciones marcadas, como queda por omisión, no filtra: sus
+    opciones salen de los años elegidos y dejarían fuera valores que solo existen en otros.
+    """
+    indice = vista["snapshot"].indice_facetas
+    selecciones = {
+        c: seleccion for c, (_, seleccion, opciones) in vista["selecciones"].items()
+        if c != columna and set(seleccion) != set(opciones)
+    }
+    return indice.mascara(selecciones)
@@ -0,0 +1,133 @@
+import plotly.express as px
+
+from agregaciones import METRICAS_ANIO, distribucion_genero, serie_por_anio
+
+
+color_map_parcela = {
+    "Área de Impacto": "#87CEEB",
+    "Área de extensión": "#2ca02c",
+    "Módulo": "#d62728",
+}
+
+color_map_genero = {
+    "Masculino": "#2ca02c",
+    "Femenino": "#ff7f0e",
+    "NA..": "#F0F0F0"
+}
+
+TITULOS_ANIO = {
+    "bitacoras": "📋 Número de Bitácoras por Año",
+    "area": "🌿 Área Total de Parcelas por Año",
+    "parcelas": "🌄 Número de Parcelas por Año",
+    "productores": "👩‍🌾👨‍🌾 Número de Productores por Año",
+}
+
+ETIQUETAS_ANIO = {
+    "Area_total_de_la_parcela(ha)": "Área (ha)",
+    "Id_Parcela(Unico)": "Parcelas",
+    "Id_Productor": "Productores",
+}
+
+
+def figura_por_anio(datos_filtrados, metrica, por_tipo=False, colores=None, bordes=False, serie=None):
+    """Gráfica de barras de una métrica por año, opcionalmente separada por tipo de parcela.
+
+    Con `serie` (p. ej. una estimación con columna "error") se grafica esa serie con barras de error.
+    """
+    nombre = METRICAS_ANIO[metrica][0]
+    if serie is None:
+        serie = serie_por_anio(datos_filtrados, metrica, por_tipo)
+    fig = px.bar(
+        serie,
+        x="Anio",
+        y=nombre,
+        error_y="error" if "error" in serie.columns else None,
+        color="Tipo_parcela" if por_tipo else None,
+        color_discrete_map=colores if por_tipo else None,
+        title=TITULOS_ANIO[metrica],
+        labels={nombre: ETIQUETAS_ANIO[nombre]} if nombre in ETIQUETAS_ANIO else None
+    )
+    if bordes:
+        fig.update_traces(marker=dict(line=dict(color="black", width=1)))
+        fig.update_xaxes(tickmode="linear", dtick=1)  # ✅ forzar años enteros
+    return fig
+
+
+def figura_genero(datos_filtrados, titulo, textinfo="percent", registros=None):
+    """Pastel de la distribución de registros por género"""
+    fig = px.pie(
+        distribucion_genero(datos_filtrados, registros),
+        names="Genero",
+        values="Registros",
+        title=titulo,
+        color="Genero",
+        color_discrete_map=color_map_genero
+    )
+    fig.update_traces(
+        textinfo=textinfo,
+        marker=dict(line=dict(color='#FFFFFF', width=2))
+    )
+    return fig
+
+
+def figura_genero_anio(datos_filtrados):
+    """Barras apiladas con el porcentaje de productores(as) por género en cada año.
+
+    Basta con una fila por año y productor (`ModeloEstrella.productores_por_anio`).
+    """
+    # Normalizar valores de género (sin modificar los datos compartidos)
+    genero = datos_filtrados["Genero"].fillna("NA..").replace({
+        "Hombre": "Masculino",
+        "Mujer": "Femenino",
+        "NA": "NA.."
+    })
+
+    # Agrupar por año y género
+    productores_genero_anio = datos_filtrados.groupby(["Anio", genero])["Id_Productor"].nunique().reset_index(name="Cantidad")
+
+    # Calcular total de productores por año
+    totales_anio = productores_genero_anio.groupby("Anio")["Cantidad"].sum().reset_index(name="Total")
+    productores_genero_anio = productores_genero_anio.merge(totales_anio, on="Anio")
+
+    # Calcular porcentaje por año
+    productores_genero_anio["Porcentaje"] = (productores_genero_anio["Cantidad"] / productores_genero_anio["Total"] * 100).round(1)
+
+    # Asignar emojis a cada género
+    emoji_genero = {
+        "Femenino": "👩 Mujeres",
+        "Masculino": "👨 Hombres",
+        "NA..": "❔ Sin dato"
+    }
+    productores_genero_anio["Genero_Emoji"] = productores_genero_anio["Genero"].map(emoji_genero)
+
+    # Crear gráfico de barras apiladas por porcentaje
+    fig = px.bar(
+        productores_genero_anio,
+        x="Anio",
+        y="Porcentaje",
+        color="Genero_Emoji",
+        title="📊 Porcentaje de Productores(as) por Género y Año",
+        labels={"Porcentaje": "% del total por año"},
+        color_discrete_map={
+            "👨 Hombres": "#2ca02c",
+            "👩 Mujeres": "#ff7f0e",
+            "❔ Sin dato": "#F0F0F0"
+        },
+        text=productores_genero_anio["Porcentaje"].astype(str) + "%"
+    )
+
+    # Configurar diseño del gráfico
+    fig.update_layout(
+        barmode="stack",
+        yaxis_tickformat=".1f",
+        yaxis_title="Porcentaje (%)",
+        xaxis_title="Año",
+        legend_title="Género",
+        height=600,
+        width=700,
+        margin=dict(l=40, r=40, t=40, b=40),
+    )
+
+    # Posicionar los textos dentro de las barras
+    fig.update_traces(textposition="inside")
+    return fig
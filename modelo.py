@@ -0,0 +1,178 @@
+import numpy as np
+import pandas as pd
+
+from agregaciones import METRICAS_ANIO, genero_tabla
+
+
+# --- Atributos que se mueven de cada bitácora a su tabla de dimensión ---
+COLUMNAS_PRODUCTOR = ["Id_Productor", "Genero"]
+COLUMNAS_PARCELA = ["Id_Parcela(Unico)", "Latitud", "Longitud", "Tipo_parcela", "Estado", "HUB_Agroecológico"]
+COLUMNAS_PROYECTO = ["Proyecto", "Categoria_Proyecto"]
+
+# --- Medidas de los hechos que se suman por grupo: columna de hechos -> nombre de salida ---
+MEDIDAS = {"bitacoras": "Bitácoras", "area": "Area_total_de_la_parcela(ha)"}
+
+# --- Atributos por los que se agrupa o se cuentan distintos: columna -> clave de su dimensión ---
+CLAVES_ATRIBUTO = {
+    "Id_Productor": "clave_productor",
+    "Genero": "clave_productor",
+    "Id_Parcela(Unico)": "clave_parcela",
+    "Tipo_parcela": "clave_parcela",
+    "Proyecto": "clave_proyecto",
+    "Categoria_Proyecto": "clave_proyecto",
+}
+
+
+def _dimension(datos, columnas):
+    """Tabla con una fila por combinación distinta de `columnas` y la clave entera de cada bitácora"""
+    presentes = [c for c in columnas if c in datos.columns]
+    claves = datos.groupby(presentes, observed=True, dropna=False, sort=False).ngroup().to_numpy(dtype=np.int32)
+    # La fila i de la dimensión es la primera bitácora con clave i
+    primeras = np.unique(claves, return_index=True)[1]
+    return datos.iloc[primeras][presentes].reset_index(drop=True), claves
+
+
+class ModeloEstrella:
+    """Hechos agregados por celda del cubo de facetas con dimensiones de productor, parcela y proyecto.
+
+    Cada hecho es una combinación distinta de (celda, productor, parcela, proyecto, cultivo)
+    con sus bitácoras, su área total y su área mayor; los hechos están ordenados por celda,
+    así que una consulta solo lee los hechos de las celdas que deja la máscara de los
+    filtros. Cada dimensión tiene una fila por combinación distinta de sus atributos (un
+    productor cuyo género se corrigió aparece dos veces), y los conteos de distintos se
+    hacen sobre el identificador de la dimensión, así que dan lo mismo que agrupar las
+    bitácoras completas.
+    """
+
+    def __init__(self, datos, indice_facetas):
+        self.indice = indice_facetas
+        self.dim_productor, clave_productor = _dimension(datos, COLUMNAS_PRODUCTOR)
+        self.dim_parcela, clave_parcela = _dimension(datos, COLUMNAS_PARCELA)
+        self.dim_proyecto, clave_proyecto = _dimension(datos, COLUMNAS_PROYECTO)
+
+        cultivo = datos["Cultivo(s)"] if "Cultivo(s)" in datos.columns else pd.Series("NA", index=datos.index)
+        codigos_cultivo, self.cultivos = pd.factorize(cultivo, use_na_sentinel=False)
+        hechos = pd.DataFrame({
+            "celda": indice_facetas.combinacion_fila,
+            "clave_productor": clave_productor,
+            "clave_parcela": clave_parcela,
+            "clave_proyecto": clave_proyecto,
+            "clave_cultivo": codigos_cultivo.astype(np.int16),
+            "area": datos["Area_total_de_la_parcela(ha)"].to_numpy(dtype=np.float64),
+        })
+        agrupado = hechos.groupby(list(hechos.columns[:-1]), sort=True)["area"]
+        self.hechos = agrupado.agg(bitacoras="size", area="sum", area_maxima="max").reset_index()
+        self.hechos["bitacoras"] = self.hechos["bitacoras"].astype(np.int32)
+        # Hechos de la celda c: posiciones inicios[c]:inicios[c + 1]
+        self.inicios = np.searchsorted(self.hechos["celda"].to_numpy(), np.arange(len(indice_facetas) + 1))
+
+        # Año de cada hecho (cada celda tiene un solo año)
+        self.anios = indice_facetas.valores["Anio"]
+        self.codigo_anio = indice_facetas.cubo["Anio"][self.hechos["celda"].to_numpy()]
+
+        # Códigos de los identificadores y atributos que se agrupan, por fila de cada dimensión
+        self.codigos = {}
+        dimensiones = {"clave_productor": self.dim_productor, "clave_parcela": self.dim_parcela, "clave_proyecto": self.dim_proyecto}
+        for columna, clave in CLAVES_ATRIBUTO.items():
+            dimension = dimensiones[clave]
+            if columna in dimension.columns:
+                # El género se agrupa con las etiquetas de la tabla de productores(as)
+                valores = genero_tabla(dimension[columna]) if columna == "Genero" else dimension[columna]
+                self.codigos[columna] = pd.factorize(valores, sort=True, use_na_sentinel=False)
+
+    def seleccion(self, mascara):
+        """Posiciones de los hechos de las celdas seleccionadas, sin recorrer las demás"""
+        celdas = np.flatnonzero(mascara)
+        inicios = self.inicios[celdas]
+        largos = self.inicios[celdas + 1] - inicios
+        return np.repeat(inicios - (np.cumsum(largos) - largos), largos) + np.arange(largos.sum())
+
+    def atributo(self, columna, seleccion):
+        """Códigos y etiquetas de un atributo para los hechos seleccionados"""
+        if columna == "Anio":
+            return self.codigo_anio[seleccion], self.anios
+        codigos, etiquetas = self.codigos[columna]
+        return codigos[self.hechos[CLAVES_ATRIBUTO[columna]].to_numpy()[seleccion]], etiquetas
+
+    def _distintos(self, seleccion, columna):
+        """Número de identificadores distintos entre los hechos seleccionados"""
+        if columna not in self.codigos:
+            return 0
+        return len(np.unique(self.atributo(columna, seleccion)[0]))
+
+    def agrupar(self, mascara, llaves, medida="bitacoras", nombre=None):
+        """Una fila por combinación de `llaves` en la selección con su medida, como un groupby de las bitácoras.
+
+        `medida` es "bitacoras", "area" o la columna de un identificador cuyos valores
+        distintos se cuentan ("Id_Productor", "Id_Parcela(Unico)").
+        """
+        seleccion = self.seleccion(mascara)
+        atributos = [self.atributo(llave, seleccion) for llave in llaves]
+        grupo = np.zeros(len(seleccion), dtype=np.int64)
+        for codigos, etiquetas in atributos:
+            grupo = grupo * len(etiquetas) + codigos
+
+        if medida in MEDIDAS:
+            grupos, inverso = np.unique(grupo, return_inverse=True)
+            valores = np.bincount(inverso, weights=self.hechos[medida].to_numpy()[seleccion], minlength=len(grupos))
+            if medida == "bitacoras":
+                valores = valores.astype(np.int64)
+        else:
+            ids, etiquetas_ids = self.atributo(medida, seleccion)
+            pares = np.unique(grupo * len(etiquetas_ids) + ids)
+            grupos, valores = np.unique(pares // len(etiquetas_ids), return_counts=True)
+            valores = valores.astype(np.int64)
+
+        # Los códigos del grupo se descomponen de la última llave a la primera
+        columnas = {}
+        for llave, (_, etiquetas) in reversed(list(zip(llaves, atributos))):
+            columnas[llave] = etiquetas.take(grupos % len(etiquetas)).array
+            grupos = grupos // len(etiquetas)
+        resultado = pd.DataFrame({llave: columnas[llave] for llave in llaves})
+        resultado[nombre or MEDIDAS.get(medida, medida)] = valores
+        return resultado
+
+    def kpis(self, mascara):
+        """Totales de bitácoras, área, parcelas y productores de la selección"""
+        seleccion = self.seleccion(mascara)
+        return {
+            "bitacoras": int(self.hechos["bitacoras"].to_numpy()[seleccion].sum()),
+            "area": self.hechos["area"].to_numpy()[seleccion].sum(),
+            "parcelas": self._distintos(seleccion, "Id_Parcela(Unico)"),
+            "productores": self._distintos(seleccion, "Id_Productor"),
+        }
+
+    def serie_por_anio(self, mascara, metrica, por_tipo=False):
+        """Misma forma que `agregaciones.serie_por_anio`, a partir de los hechos de la selección"""
+        nombre, columna, _ = METRICAS_ANIO[metrica]
+        llaves = ["Anio", "Tipo_parcela"] if por_tipo else ["Anio"]
+        return self.agrupar(mascara, llaves, metrica if metrica in MEDIDAS else columna, nombre)
+
+    def registros_genero(self, mascara):
+        """Bitácoras por género de la selección, contadas sobre los hechos de sus celdas"""
+        seleccion = self.seleccion(mascara)
+        claves = self.hechos["clave_productor"].to_numpy()[seleccion]
+        conteos = np.bincount(claves, weights=self.hechos["bitacoras"].to_numpy()[seleccion], minlength=len(self.dim_productor))
+        registros = pd.Series(conteos.astype(np.int64), index=self.dim_productor.index)
+        return registros.groupby(self.dim_productor["Genero"], observed=True).sum()
+
+    def productores_por_anio(self, mascara):
+        """Una fila por año y productor de la selección, con los atributos de su dimensión"""
+        seleccion = self.seleccion(mascara)
+        n_productores = len(self.dim_productor)
+        llave = np.unique(self.codigo_anio[seleccion].astype(np.int64) * n_productores + self.hechos["clave_productor"].to_numpy()[seleccion])
+        productores = self.dim_productor.iloc[llave % n_productores].reset_index(drop=True)
+        productores.insert(0, "Anio", self.anios.take(llave // n_productores).array)
+        return productores
+
+    def parcelas(self, mascara, con_cultivo=False):
+        """Una fila por parcela de la selección (y por cultivo, si se pide) con sus atributos"""
+        seleccion = self.seleccion(mascara)
+        claves = self.hechos["clave_parcela"].to_numpy()[seleccion].astype(np.int64)
+        if not con_cultivo:
+            return self.dim_parcela.iloc[np.unique(claves)].reset_index(drop=True)
+        n_cultivos = len(self.cultivos)
+        llave = np.unique(claves * n_cultivos + self.hechos["clave_cultivo"].to_numpy()[seleccion])
+        parcelas = self.dim_parcela.iloc[llave // n_cultivos].reset_index(drop=True)
+        parcelas["Cultivo(s)"] = self.cultivos[llave % n_cultivos]
+        return parcelas
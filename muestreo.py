@@ -0,0 +1,122 @@
+import numpy as np
+import pandas as pd
+
+from agregaciones import METRICAS_ANIO
+
+
+# --- Estratos de la muestra que se guarda en la ingesta ---
+ESTRATOS = ["Anio", "HUB_Agroecológico", "Tipo_parcela"]
+FRACCION_MUESTRA = 0.05
+MINIMO_POR_ESTRATO = 30
+Z_95 = 1.96
+
+# Métricas que se pueden estimar como totales; los conteos únicos esperan al cálculo exacto
+METRICAS_ESTIMABLES = ["bitacoras", "area"]
+
+# Por debajo de este número de bitácoras el cálculo exacto ya es inmediato
+FILAS_MINIMAS_APROXIMADO = 50_000
+
+
+class MuestraEstratificada:
+    """Muestra aleatoria estratificada por Anio × HUB × Tipo_parcela, tomada una vez por snapshot.
+
+    De cada estrato se toma `FRACCION_MUESTRA` de sus bitácoras (al menos
+    `MINIMO_POR_ESTRATO`, o todas si tiene menos). Las estimaciones de una selección
+    usan la máscara del cubo de facetas sobre las filas de la muestra, así que no
+    recorren los datos completos; cada total viene con su intervalo de confianza al 95%.
+    """
+
+    def __init__(self, datos, indice_facetas, fraccion=FRACCION_MUESTRA, minimo=MINIMO_POR_ESTRATO, semilla=0):
+        columnas = [c for c in ESTRATOS if c in datos.columns]
+        estratos = datos.groupby(columnas, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+        self.N = np.bincount(estratos).astype(np.float64)
+        self.n = np.minimum(self.N, np.maximum(minimo, np.ceil(fraccion * self.N)))
+
+        # Muestreo sin reemplazo: orden aleatorio dentro de cada estrato y se toman los primeros n
+        orden = np.lexsort((np.random.default_rng(semilla).random(len(datos)), estratos))
+        inicio = np.concatenate([[0], np.cumsum(self.N)[:-1]]).astype(np.int64)
+        rango = np.arange(len(datos)) - inicio[estratos[orden]]
+        posiciones = np.sort(orden[rango < self.n[estratos[orden]]])
+
+        self.posiciones = posiciones
+        self.estrato = estratos[posiciones]
+        self.celda = indice_facetas.combinacion_fila[posiciones]
+        self.muestra = datos.iloc[posiciones].reset_index(drop=True)
+
+    def __len__(self):
+        return len(self.posiciones)
+
+    def _sumas(self, y, grupo, n_grupos, estrato):
+        """Suma de y y de y² por grupo y estrato"""
+        n_estratos = len(self.N)
+        llave = grupo * n_estratos + estrato
+        suma = np.bincount(llave, weights=y, minlength=n_grupos * n_estratos).reshape(n_grupos, n_estratos)
+        cuadrados = np.bincount(llave, weights=y * y, minlength=n_grupos * n_estratos).reshape(n_grupos, n_estratos)
+        return suma, cuadrados
+
+    def _varianza(self, suma, cuadrados):
+        # Varianza muestral de y dentro de cada estrato; y = 0 para las filas fuera del grupo
+        s2 = np.where(self.n > 1, (cuadrados - suma ** 2 / self.n) / np.maximum(self.n - 1, 1), 0.0)
+        return (self.N ** 2 * (1 - self.n / self.N) * s2 / self.n).sum(axis=1)
+
+    def _seleccion(self, mascara, llaves):
+        incluidas = mascara[self.celda]
+        muestra = self.muestra[incluidas]
+        if llaves:
+            agrupado = muestra.groupby(llaves, observed=True, sort=True)
+            grupo = agrupado.ngroup().to_numpy()
+            etiquetas = agrupado.size().index
+        else:
+            grupo = np.zeros(len(muestra), dtype=np.int64)
+            etiquetas = pd.Index(["Total"])
+        return muestra, grupo, etiquetas, self.estrato[incluidas]
+
+    def estimar(self, mascara, llaves=None, columna=None):
+        """Total estimado (conteo de bitácoras o suma de `columna`) por grupo de `llaves`, con IC 95%"""
+        muestra, grupo, etiquetas, estrato = self._seleccion(mascara, llaves)
+        y = np.ones(len(muestra)) if columna is None else muestra[columna].to_numpy(dtype=np.float64)
+        suma, cuadrados = self._sumas(y, grupo, len(etiquetas), estrato)
+        return pd.DataFrame({
+            "estimado": (suma * (self.N / self.n)).sum(axis=1),
+            "error": Z_95 * np.sqrt(self._varianza(suma, cuadrados)),
+        }, index=etiquetas)
+
+    def porcentajes(self, mascara, llave_total, llave_parte):
+        """Porcentaje de bitácoras de cada `llave_parte` dentro de su `llave_total`, con IC 95%.
+
+        Es un estimador de razón; su varianza sale de los residuos e = 1[parte] - R·1[total].
+        """
+        muestra, grupo, etiquetas, estrato = self._seleccion(mascara, [llave_total, llave_parte])
+        if not len(etiquetas):
+            return pd.DataFrame(columns=["Porcentaje", "error"])
+        codigos_total, totales = pd.factorize(etiquetas.get_level_values(0))
+        grupo_total = codigos_total[grupo]
+
+        parte, _ = self._sumas(np.ones(len(muestra)), grupo, len(etiquetas), estrato)
+        total, _ = self._sumas(np.ones(len(muestra)), grupo_total, len(totales), estrato)
+        total = total[codigos_total]
+        expansion = self.N / self.n
+        razon = (parte * expansion).sum(axis=1) / (total * expansion).sum(axis=1)
+
+        # Como las y son indicadoras: Σe = parte - R·total y Σe² = parte·(1 - 2R) + R²·total
+        r = razon[:, None]
+        suma_e = parte - r * total
+        cuadrados_e = parte * (1 - 2 * r) + r ** 2 * total
+        error = Z_95 * np.sqrt(np.maximum(self._varianza(suma_e, cuadrados_e), 0)) / (total * expansion).sum(axis=1)
+        return pd.DataFrame({"Porcentaje": razon * 100, "error": error * 100}, index=etiquetas)
+
+
+def kpis_aproximados(muestra, mascara):
+    """Bitácoras y área total estimadas con su intervalo de confianza"""
+    return {
+        "bitacoras": muestra.estimar(mascara).iloc[0],
+        "area": muestra.estimar(mascara, columna="Area_total_de_la_parcela(ha)").iloc[0],
+    }
+
+
+def serie_aproximada(muestra, mascara, metrica, por_tipo=False):
+    """Misma forma que `serie_por_anio`, con una columna "error" (IC 95%)"""
+    nombre, columna, _ = METRICAS_ANIO[metrica]
+    llaves = ["Anio", "Tipo_parcela"] if por_tipo else ["Anio"]
+    estimado = muestra.estimar(mascara, llaves, columna)
+    return estimado.rename(columns={"estimado": nombre}).reset_index(names=llaves)
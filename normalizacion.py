@@ -0,0 +1,93 @@
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+from catalogos import centros_estados
+
+
+# --- Columnas categóricas que se canonizan en la ingesta ---
+COLUMNAS_CANONICAS = [
+    "Estado", "Proyecto", "Categoria_Proyecto", "Tipo de sistema", "Tipo_parcela",
+    "Ciclo", "Tipo_Regimen_Hidrico", "HUB_Agroecológico", "Cultivo(s)"
+]
+
+
+# --- Función para normalizar texto ---
+def normalizar_texto(texto):
+    if pd.isna(texto):
+        return texto
+    texto_norm = ''.join(
+        c for c in unicodedata.normalize('NFD', texto)
+        if unicodedata.category(c) != 'Mn'
+    )
+    return texto_norm.strip().capitalize()
+
+
+def clave_canonica(texto):
+    """Llave de comparación: sin acentos, en minúsculas y con espacios simples"""
+    return " ".join(str(normalizar_texto(str(texto))).lower().split())
+
+
+# --- Tabla de alias mantenida a mano: columna -> {llave normalizada: valor canónico} ---
+# Los estados del catálogo se agregan solos; aquí van solo las variantes que no coinciden por llave.
+ALIAS = {
+    "Estado": {
+        "estado de mexico": "México",
+        "edo. de mexico": "México",
+        "edomex": "México",
+        "cdmx": "Ciudad de México",
+        "distrito federal": "Ciudad de México",
+        "coahuila de zaragoza": "Coahuila",
+        "michoacan de ocampo": "Michoacán",
+        "veracruz de ignacio de la llave": "Veracruz",
+    },
+    "Cultivo(s)": {
+        "maiz": "Maíz",
+    },
+}
+for _estado in centros_estados:
+    ALIAS["Estado"].setdefault(clave_canonica(_estado), _estado)
+
+
+def _preferencia(valor, frecuencia):
+    """Orden de preferencia entre variantes: con mayúsculas, con acentos, no todo en mayúsculas, más frecuente"""
+    texto = str(valor)
+    con_mayusculas = texto != texto.lower()
+    con_acentos = unicodedata.normalize("NFD", texto) != texto
+    sin_gritar = texto != texto.upper()
+    return (con_mayusculas, con_acentos, sin_gritar, frecuencia)
+
+
+def canonizar_columna(serie, alias=None):
+    """Unifica las variantes de una columna trabajando solo sobre sus valores distintos.
+
+    Los valores que comparten llave normalizada se reemplazan por su alias, o si no
+    hay alias, por la variante mejor escrita ("PV" antes que "pv", "Maíz" antes que
+    "Maiz", "Bajío" antes que "BAJÍO"); entre variantes igual de bien escritas gana la más frecuente. El
+    resultado es una columna categórica.
+    """
+    alias = alias or {}
+    codigos, valores = pd.factorize(serie)
+    frecuencias = np.bincount(codigos[codigos >= 0], minlength=len(valores))
+
+    # Variante preferida de cada llave (O(valores distintos))
+    claves = [clave_canonica(v) for v in valores]
+    preferida = {}
+    for clave, valor, frecuencia in zip(claves, valores, frecuencias):
+        orden = _preferencia(valor, frecuencia)
+        if clave not in preferida or orden > preferida[clave][1]:
+            preferida[clave] = (valor, orden)
+    canonicos = [alias.get(clave, preferida[clave][0]) for clave in claves]
+
+    categorias = pd.Index(sorted(set(canonicos), key=str))
+    mapa = np.append(categorias.get_indexer(canonicos), -1)
+    return pd.Categorical.from_codes(mapa[codigos], categories=categorias)
+
+
+def canonizar(datos, columnas=COLUMNAS_CANONICAS):
+    """Canoniza en sitio las columnas categóricas presentes en los datos"""
+    for col in columnas:
+        if col in datos.columns:
+            datos[col] = canonizar_columna(datos[col], ALIAS.get(col))
+    return datos
@@ -0,0 +1,59 @@
+import json
+
+import streamlit as st
+
+from cobertura import leer_hubs
+from figuras_mapa import figura_cobertura, nombre_leyenda_dict
+from filtros import vista_actual
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+
+st.markdown("### 🗺️ Cobertura por HUB")
+st.caption(
+    "Áreas de los polígonos calculadas en una proyección Albers equivalente para México. "
+    "Cada parcela cuenta en el polígono que contiene su ubicación registrada."
+)
+
+try:
+    cobertura = snapshot.cobertura_hubs
+except OSError:
+    st.warning("⚠️ No se encontró el archivo de polígonos de los HUBs.")
+    st.stop()
+
+
+# --- Métricas por estado del filtro; la reproyección y el spatial join ya vienen en el snapshot ---
+@st.cache_data(show_spinner=False, max_entries=32)
+def metricas_cobertura(version, clave_filtro, _cobertura, _mascara):
+    return _cobertura.metricas(_mascara), _cobertura.cobertura_anual(_mascara)
+
+
+@st.cache_resource(show_spinner="Preparando polígonos de los HUBs...")
+def geojson_hubs(version):
+    # Geometría simplificada (~100 m) solo para dibujar
+    hubs = leer_hubs()
+    hubs["geometry"] = hubs.simplify(0.001)
+    return json.loads(hubs[["Nombre", "geometry"]].to_json())
+
+
+version = (snapshot.clave, snapshot.version)
+tabla, anual = metricas_cobertura(version, vista["clave_filtro"], cobertura, vista["mascara_facetas"])
+
+metrica = st.radio(
+    "Relleno del mapa",
+    ["Parcelas por km²", "Cobertura (%)", "Área atendida (ha)"],
+    horizontal=True,
+    key="cobertura_metrica"
+)
+st.plotly_chart(figura_cobertura(tabla, geojson_hubs(version), metrica), use_container_width=True)
+
+tabla_vista = tabla.assign(HUB=tabla["Nombre"].map(lambda n: nombre_leyenda_dict.get(n, n))).drop(columns=["Nombre"])
+st.dataframe(
+    tabla_vista.set_index("HUB").round({"Área del polígono (ha)": 0, "Área atendida (ha)": 2, "Parcelas por km²": 4, "Cobertura (%)": 4}),
+    use_container_width=True
+)
+
+st.markdown("#### 📅 Cobertura (%) por año")
+anual.index = anual.index.map(lambda n: nombre_leyenda_dict.get(n, n))
+st.dataframe(anual.round(4), use_container_width=True)
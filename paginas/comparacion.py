@@ -0,0 +1,91 @@
+import hashlib
+
+import plotly.express as px
+import streamlit as st
+
+from comparacion import IDENTIFICADORES, etiqueta_periodo
+from filtros import mascara_sin_faceta, vista_actual
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+almacen = snapshot.almacen_periodos
+
+st.markdown("### 🔁 Comparación entre Periodos")
+st.caption(
+    "La comparación respeta los filtros del sidebar excepto el de Año: los periodos se eligen aquí. "
+    "Un filtro con todas sus opciones marcadas no se aplica; uno con solo algunas marcadas deja fuera "
+    "los valores que no aparecen en los años elegidos del sidebar."
+)
+
+# La llave de caché sale de la máscara sin el eje de Año, que es la que define las bitácoras comparadas
+celdas = mascara_sin_faceta(vista, "Anio")
+clave_celdas = hashlib.sha1(celdas.tobytes()).hexdigest()
+if celdas.all():
+    celdas = None
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def comparar(version, clave_celdas, periodo_a, periodo_b, dimension, _almacen, _celdas):
+    return _almacen.comparar(periodo_a, periodo_b, dimension, _celdas)
+
+# --- Selección de periodos y desglose ---
+col_g, col_a, col_b, col_d = st.columns(4)
+with col_g:
+    granularidad = st.radio("Periodo", list(almacen.periodos), horizontal=True, key="comparacion_granularidad")
+periodos = almacen.periodos[granularidad]
+if len(periodos) < 2:
+    st.warning("⚠️ Se necesitan al menos dos periodos para comparar.")
+    st.stop()
+with col_a:
+    periodo_a = st.selectbox("Periodo A", periodos, index=len(periodos) - 2, format_func=etiqueta_periodo, key=f"comparacion_a_{granularidad}")
+with col_b:
+    periodo_b = st.selectbox("Periodo B", periodos, index=len(periodos) - 1, format_func=etiqueta_periodo, key=f"comparacion_b_{granularidad}")
+with col_d:
+    dimension = st.radio("Desglose", list(almacen.valores), horizontal=True, key="comparacion_dimension")
+
+# --- Métricas totales con su variación ---
+version = (snapshot.clave, snapshot.version)
+total = comparar(version, clave_celdas, periodo_a, periodo_b, "Total", almacen, celdas)
+if total.empty:
+    st.warning("⚠️ No hay bitácoras en ninguno de los dos periodos.")
+    st.stop()
+fila = total.iloc[0]
+columnas = st.columns(2 + 2 * len(IDENTIFICADORES))
+columnas[0].metric("📋 Bitácoras", f"{fila['Bitácoras B']:,}", f"{fila['Bitácoras B'] - fila['Bitácoras A']:+,}")
+columnas[1].metric("🌿 Área (ha)", f"{fila['Área (ha) B']:,.2f}", f"{fila['Área (ha) B'] - fila['Área (ha) A']:+,.2f}")
+for i, nombre in enumerate(IDENTIFICADORES):
+    if f"{nombre} A" not in fila:
+        continue
+    columnas[2 + 2 * i].metric(nombre, f"{fila[f'{nombre} B']:,}", f"{fila[f'{nombre} B'] - fila[f'{nombre} A']:+,}")
+    columnas[3 + 2 * i].metric(
+        f"Retención {nombre.lower()}",
+        f"{fila[f'Retención {nombre} (%)']:.1f}%",
+        f"{fila[f'{nombre} nuevos']:,} nuevos",
+        delta_color="off"
+    )
+
+# --- Desglose por HUB o Proyecto ---
+if dimension != "Total":
+    desglose = comparar(version, clave_celdas, periodo_a, periodo_b, dimension, almacen, celdas)
+
+    st.write("")
+    st.markdown(f"### 👩‍🌾 Productores(as) nuevos y retenidos por {dimension}: {etiqueta_periodo(periodo_a)} → {etiqueta_periodo(periodo_b)}")
+    if "Productores retenidos" in desglose.columns and not desglose.empty:
+        grafica = desglose.melt(
+            id_vars=dimension,
+            value_vars=["Productores retenidos", "Productores nuevos"],
+            var_name="Tipo",
+            value_name="Productores"
+        )
+        fig = px.bar(
+            grafica,
+            x=dimension,
+            y="Productores",
+            color="Tipo",
+            color_discrete_map={"Productores retenidos": "#2ca02c", "Productores nuevos": "#ff7f0e"}
+        )
+        fig.update_layout(barmode="stack", xaxis_title=None, legend_title=None)
+        st.plotly_chart(fig, use_container_width=True)
+
+    st.dataframe(desglose.round(2), use_container_width=True, hide_index=True)
@@ -0,0 +1,71 @@
+import plotly.express as px
+import streamlit as st
+
+from distribucion import PRECISION_RELATIVA, histograma, resumen_cuantiles, resumen_exacto
+from filtros import vista_actual
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+sketches = snapshot.sketches_area
+
+st.markdown("### 📐 Distribución del Área por Parcela")
+st.caption(
+    f"Cuantiles aproximados a partir de sketches precalculados por celda (error relativo ≤ {PRECISION_RELATIVA:.0%}). "
+    "Activa el cálculo exacto para compararlos con las bitácoras filtradas."
+)
+
+GRUPOS = {
+    "Total": None,
+    "HUB": "HUB_Agroecológico",
+    "Tipo de Parcela": "Tipo_parcela",
+    "Proyecto": "Proyecto",
+}
+
+col_grupo, col_exacto = st.columns([3, 1])
+with col_grupo:
+    nombre_grupo = st.radio("Agrupar por", list(GRUPOS), horizontal=True, key="distribucion_grupo")
+with col_exacto:
+    exacto = st.toggle("Cálculo exacto", value=False, key="distribucion_exacto")
+grupo = GRUPOS[nombre_grupo]
+
+fusionados = sketches.fusionar(vista["mascara_facetas"], grupo)
+tabla = resumen_cuantiles(fusionados)
+if tabla.empty:
+    st.warning("⚠️ No hay bitácoras para los filtros seleccionados.")
+    st.stop()
+tabla = tabla.sort_values("Bitácoras", ascending=False)
+
+# --- Mediana y p90 por grupo ---
+if grupo:
+    fig = px.bar(
+        tabla.head(30).melt(id_vars="Grupo", value_vars=["p50 (ha)", "p90 (ha)"], var_name="Cuantil", value_name="Área (ha)"),
+        x="Grupo",
+        y="Área (ha)",
+        color="Cuantil",
+        barmode="group",
+        title=f"🌿 Mediana y percentil 90 del área por {nombre_grupo}"
+    )
+    fig.update_layout(xaxis_title=None)
+    st.plotly_chart(fig, use_container_width=True)
+
+st.dataframe(tabla.round(2), use_container_width=True, hide_index=True)
+
+if exacto:
+    st.markdown("#### Cálculo exacto")
+    st.dataframe(resumen_exacto(vista["datos_filtrados"], grupo).round(2), use_container_width=True, hide_index=True)
+
+# --- Histograma de un grupo ---
+st.write("")
+elegido = st.selectbox("Histograma de", list(tabla["Grupo"]), key="distribucion_histograma") if grupo else "Total"
+barras = histograma(fusionados[elegido])
+barras["Rango"] = barras["Desde (ha)"].round(2).astype(str) + " – " + barras["Hasta (ha)"].round(2).astype(str)
+fig_hist = px.bar(
+    barras,
+    x="Rango",
+    y="Bitácoras",
+    title=f"📊 Histograma del área por parcela ({elegido})",
+    labels={"Rango": "Área (ha, escala logarítmica)"}
+)
+fig_hist.update_traces(marker=dict(line=dict(color="black", width=1)))
+st.plotly_chart(fig_hist, use_container_width=True)
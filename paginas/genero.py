@@ -0,0 +1,25 @@
+import streamlit as st
+
+from filtros import vista_actual
+from graficas import figura_genero, figura_genero_anio
+
+
+vista = vista_actual()
+datos_filtrados = vista["datos_filtrados"]
+# Las consultas de género leen los hechos de las celdas seleccionadas y la dimensión de productores
+modelo = vista["snapshot"].modelo_estrella
+mascara = vista["mascara_facetas"]
+
+# --- Gráfico de distribución por género ---
+if "Genero" in datos_filtrados.columns:
+    fig_genero = figura_genero(
+        datos_filtrados, "👩👨 Distribución Total de Productores(as) por Género",
+        registros=modelo.registros_genero(mascara)
+    )
+    st.plotly_chart(fig_genero, use_container_width=True)
+
+
+# --- Gráfico de evolución de productores por género a lo largo de los años ---
+if "Genero" in datos_filtrados.columns and "Anio" in datos_filtrados.columns:
+    st.markdown("###")
+    st.plotly_chart(figura_genero_anio(modelo.productores_por_anio(mascara)), use_container_width=True)
@@ -0,0 +1,82 @@
+import streamlit as st
+
+from cobertura import leer_hubs
+from figuras_mapa import agregar_focos, agregar_hubs, crear_figura, figura_estados
+from filtros import vista_actual
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+datos_filtrados = vista["datos_filtrados"]
+# Los mapas trabajan sobre las parcelas distintas de la selección (dimensión de parcelas)
+modelo = snapshot.modelo_estrella
+mascara = vista["mascara_facetas"]
+
+st.markdown("### 🌎 Mapas")
+
+st.write("")
+
+# --- --- --- Streamlit: Slider de zoom --- --- --- #
+zoom = st.slider("Nivel de zoom de los puntos del mapa", 4, 12, 4, key="mapas_zoom")
+
+# --- --- --- Crear figura de parcelas --- --- --- #
+fig_mapa_geo = crear_figura(modelo.parcelas(mascara, con_cultivo=True), zoom=zoom)
+
+# --- --- --- Cargar y filtrar HUBs --- --- --- #
+@st.cache_resource(show_spinner="Cargando polígonos de los HUBs...")
+def cargar_hubs():
+    return leer_hubs()
+
+hubs = cargar_hubs()
+
+hub_seleccionado = st.selectbox("Selecciona el limite del HUB", ["Todos"] + list(hubs["Nombre"].unique()), key="hub_seleccionado")
+hubs_to_plot = hubs if hub_seleccionado == "Todos" else hubs[hubs["Nombre"] == hub_seleccionado]
+
+# --- --- --- Slider para transparencia de polígonos HUB --- --- --- #
+transparencia = st.slider("Transparencia del color de los polígonos que delimitan a los HUBs", 0.01, 0.5, 0.05, 0.01, key="mapas_transparencia")
+
+# --- --- --- Agregar polígonos HUBs al mapa --- --- --- #
+agregar_hubs(fig_mapa_geo, hubs_to_plot, transparencia)
+
+# --- --- --- Focos de concentración (capa opcional) --- --- --- #
+@st.cache_data(show_spinner="Buscando focos de concentración...", max_entries=32)
+def calcular_focos(version, clave_filtro, radio_km, minimo_parcelas, tipo, _indice, _posiciones):
+    return _indice.focos(_posiciones, radio_km, minimo_parcelas, tipo)
+
+resumen_focos = None
+if st.toggle("🔥 Mostrar focos de concentración de parcelas", value=False, key="mapas_focos"):
+    # scikit-learn y scipy solo se importan cuando se activa la capa de focos
+    from proximidad import TIPO_MODULO, TIPOS_CERCANOS, hub_que_contiene
+
+    col_radio, col_minimo, col_tipo = st.columns(3)
+    radio_km = col_radio.slider("Radio de vecindad (km)", 0.5, 20.0, 2.0, 0.5, key="focos_radio")
+    minimo_parcelas = col_minimo.slider("Parcelas mínimas por foco", 3, 50, 10, key="focos_minimo")
+    tipo_foco = col_tipo.selectbox("Tipo de parcela", ["Todas", TIPO_MODULO, *TIPOS_CERCANOS], key="focos_tipo")
+
+    indice = snapshot.indice_espacial
+    posiciones = indice.posiciones(datos_filtrados)
+    agrupadas, etiquetas = calcular_focos(
+        (snapshot.clave, snapshot.version), vista["clave_filtro"], radio_km, minimo_parcelas,
+        None if tipo_foco == "Todas" else tipo_foco, indice, posiciones
+    )
+    resumen_focos = indice.resumen_focos(agrupadas, etiquetas)
+    if not resumen_focos.empty:
+        agregar_focos(fig_mapa_geo, indice.puntos_focos(agrupadas, etiquetas), resumen_focos)
+
+# --- --- --- Mostrar mapa final --- --- --- #
+st.plotly_chart(fig_mapa_geo, use_container_width=True)
+
+if resumen_focos is not None:
+    if resumen_focos.empty:
+        st.info("No se encontraron focos con estos parámetros.")
+    else:
+        resumen_focos.insert(len(resumen_focos.columns) - 3, "Polígono de HUB", hub_que_contiene(resumen_focos, hubs))
+        st.markdown(f"#### 🔥 {len(resumen_focos):,} focos de concentración")
+        st.dataframe(resumen_focos.round(4), use_container_width=True, hide_index=True)
+
+# -----------------------------------
+# --- Mapa de burbujas por estado según el filtro activo ---
+fig_estado = figura_estados(modelo.parcelas(mascara))
+
+# --- Mostrar en Streamlit ---
+st.plotly_chart(fig_estado, use_container_width=True)
@@ -0,0 +1,80 @@
+import plotly.express as px
+import streamlit as st
+
+from filtros import vista_actual
+from proximidad import TIPOS_CERCANOS
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+datos_filtrados = vista["datos_filtrados"]
+
+st.markdown("### 📏 Parcelas cercanas a cada Módulo")
+st.write("")
+
+indice = snapshot.indice_espacial
+posiciones = indice.posiciones(datos_filtrados)
+clave_filtro = vista["clave_filtro"]
+
+
+# --- Consultas cacheadas por snapshot, estado del filtro y radio ---
+@st.cache_data(show_spinner="Buscando parcelas cercanas...", max_entries=32)
+def conteos_en_radio(version, clave_filtro, radio_km, _indice, _posiciones):
+    return _indice.conteos_en_radio(_posiciones, radio_km)
+
+
+@st.cache_data(show_spinner="Asignando el módulo más cercano...", max_entries=32)
+def modulo_mas_cercano(version, clave_filtro, _indice, _posiciones):
+    return _indice.modulo_mas_cercano(_posiciones)
+
+
+version = (snapshot.clave, snapshot.version)
+radio_km = st.slider("Radio de búsqueda (km)", 1, 100, 10, key="proximidad_radio")
+cercanas = conteos_en_radio(version, clave_filtro, radio_km, indice, posiciones)
+
+if cercanas.empty:
+    st.warning("⚠️ No hay parcelas Módulo con coordenadas en la selección actual.")
+    st.stop()
+
+col1, col2, col3 = st.columns(3)
+col1.metric("🔴 Módulos", f"{len(cercanas):,}")
+col2.metric(f"🟢 {TIPOS_CERCANOS[0]} a ≤ {radio_km} km (promedio)", f"{cercanas[TIPOS_CERCANOS[0]].mean():,.1f}")
+col3.metric(f"🔵 {TIPOS_CERCANOS[1]} a ≤ {radio_km} km (promedio)", f"{cercanas[TIPOS_CERCANOS[1]].mean():,.1f}")
+
+fig = px.scatter_mapbox(
+    cercanas,
+    lat="Latitud",
+    lon="Longitud",
+    size=cercanas["Total cercanas"].clip(lower=1),
+    color="Total cercanas",
+    hover_name="Id_Parcela(Unico)",
+    hover_data={c: True for c in TIPOS_CERCANOS} | {"Latitud": False, "Longitud": False},
+    color_continuous_scale="Plasma",
+    size_max=30,
+    zoom=4.0,
+    center={"lat": 23.0, "lon": -102.0},
+    mapbox_style="carto-positron",
+    title=f"📍 Parcelas de extensión e impacto a menos de {radio_km} km de cada Módulo"
+)
+fig.update_layout(margin={"l": 0, "r": 0, "t": 50, "b": 0}, height=600)
+st.plotly_chart(fig, use_container_width=True)
+
+st.dataframe(cercanas.drop(columns=["Latitud", "Longitud"]), use_container_width=True, hide_index=True)
+
+# --- Asignación de cada parcela a su Módulo más cercano ---
+st.write("")
+st.markdown("### 🧭 Módulo más cercano por parcela")
+asignacion = modulo_mas_cercano(version, clave_filtro, indice, posiciones)
+resumen = (
+    asignacion.groupby("Módulo más cercano")
+    .agg(Parcelas=("Id_Parcela(Unico)", "size"), Distancia_promedio_km=("Distancia (km)", "mean"), Distancia_maxima_km=("Distancia (km)", "max"))
+    .reset_index()
+    .sort_values("Parcelas", ascending=False)
+)
+st.dataframe(resumen.round(2), use_container_width=True, hide_index=True)
+st.download_button(
+    "⬇️ Descargar asignación completa (CSV)",
+    asignacion.to_csv(index=False).encode("utf-8"),
+    file_name="modulo_mas_cercano.csv",
+    mime="text/csv"
+)
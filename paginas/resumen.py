@@ -0,0 +1,92 @@
+import streamlit as st
+
+from agregaciones import METRICAS_ANIO
+from filtros import vista_actual
+from graficas import TITULOS_ANIO, color_map_parcela, figura_por_anio
+from muestreo import METRICAS_ESTIMABLES, kpis_aproximados, serie_aproximada
+from refinamiento import esperar_exacto, exacto_fallido, exacto_listo
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+datos_filtrados = vista["datos_filtrados"]
+# KPIs y series salen de los hechos del modelo estrella de las celdas seleccionadas
+modelo = snapshot.modelo_estrella
+mascara = vista["mascara_facetas"]
+seleccion_tipos_parcela = vista["selecciones"]["Tipo_parcela"][1]
+
+por_tipo = bool(seleccion_tipos_parcela)
+
+
+# --- Cálculo exacto de KPIs y series; en modo aproximado corre en segundo plano ---
+def calcular_resumen(modelo, mascara, por_tipo):
+    series = {
+        metrica: modelo.serie_por_anio(mascara, metrica, por_tipo)
+        for metrica, (_, columna, _) in METRICAS_ANIO.items()
+        if columna is None or columna in snapshot.datos.columns
+    }
+    return modelo.kpis(mascara), series
+
+
+if vista["aproximado"]:
+    exacto = exacto_listo(vista, f"resumen_{por_tipo}", calcular_resumen, modelo, mascara, por_tipo)
+else:
+    exacto = calcular_resumen(modelo, mascara, por_tipo)
+
+# ----------------------------
+# --- Métricas principales ---
+# ----------------------------
+col_r1, col_r2, col_r3, col_r4 = st.columns(4)
+if exacto is None:
+    esperar_exacto(vista, f"resumen_{por_tipo}", calcular_resumen, modelo, mascara, por_tipo)
+    muestra = snapshot.muestra_estratificada
+    estimados = kpis_aproximados(muestra, vista["mascara_facetas"])
+    bitacoras, area = estimados["bitacoras"], estimados["area"]
+    col_r1.metric("📋 Total de Bitácoras", f"≈ {bitacoras['estimado']:,.0f}", help=f"± {bitacoras['error']:,.0f} (IC 95%)")
+    col_r2.metric("🌿 Área Total (ha)", f"≈ {area['estimado']:,.2f}", help=f"± {area['error']:,.2f} (IC 95%)")
+    # Los conteos únicos no se estiman: quedan pendientes o sin valor si el cálculo exacto falló
+    pendiente = "—" if exacto_fallido(vista, f"resumen_{por_tipo}") else "⏳"
+    col_r3.metric("🌄 Número de Parcelas Totales", pendiente)
+    col_r4.metric("👩‍🌾 Productores(as) Totales", pendiente)
+    series = {
+        metrica: serie_aproximada(muestra, vista["mascara_facetas"], metrica, por_tipo)
+        for metrica in METRICAS_ESTIMABLES
+    }
+else:
+    totales, series = exacto
+    col_r1.metric("📋 Total de Bitácoras", f"{totales['bitacoras']:,}")
+    col_r2.metric("🌿 Área Total (ha)", f"{totales['area']:,.2f}")
+    col_r3.metric("🌄 Número de Parcelas Totales", f"{totales['parcelas']:,}")
+    col_r4.metric("👩‍🌾 Productores(as) Totales", f"{totales['productores']:,}")
+
+
+st.markdown("---")  # Esta es la línea de separación
+
+st.write("")
+
+st.markdown("### 📉 Gráficas")
+
+st.write("")
+
+# --- Gráficas principales ---
+for fila in (["bitacoras", "area"], ["parcelas", "productores"]):
+    for col, metrica in zip(st.columns(2), fila):
+        with col:
+            if metrica in series:
+                fig = figura_por_anio(datos_filtrados, metrica, por_tipo, color_map_parcela, bordes=True, serie=series[metrica])
+                st.plotly_chart(fig, use_container_width=True)
+            elif exacto is None:
+                st.info(f"⏳ {TITULOS_ANIO[metrica]}: se muestra al terminar el cálculo exacto.")
+
+# --- Calidad de los datos: filas separadas en la ingesta ---
+calidad = snapshot.calidad
+if calidad:
+    st.markdown("---")
+    with st.expander(f"🧪 Calidad de los datos: {calidad['total'] - calidad['limpias']:,} de {calidad['total']:,} bitácoras en cuarentena"):
+        st.dataframe(calidad["motivos"], use_container_width=True, hide_index=True)
+        st.download_button(
+            "⬇️ Descargar bitácoras en cuarentena (CSV)",
+            snapshot.cuarentena_csv,
+            file_name="bitacoras_en_cuarentena.csv",
+            mime="text/csv"
+        )
@@ -0,0 +1,72 @@
+import streamlit as st
+
+from agregaciones import tabla_categorias, tabla_productores_genero, tabla_proyectos
+from filtros import vista_actual
+from refinamiento import esperar_exacto, exacto_listo
+from tabla_detalle import mostrar_tabla_detalle
+
+
+vista = vista_actual()
+snapshot = vista["snapshot"]
+datos = snapshot.datos
+datos_filtrados = vista["datos_filtrados"]
+# Las tablas agregan los hechos del modelo estrella de las celdas seleccionadas
+modelo = snapshot.modelo_estrella
+mascara = vista["mascara_facetas"]
+
+st.markdown("### 🧮 Tablas")
+st.write("")
+
+# --- Tablas exactas; en modo aproximado se calculan en segundo plano ---
+def calcular_tablas(modelo, mascara):
+    productores = None
+    if {"Id_Productor", "Genero"}.issubset(modelo.codigos):
+        productores = tabla_productores_genero(tabla_base=modelo.agrupar(mascara, ["Proyecto", "Anio", "Genero"], "Id_Productor"))
+    return (
+        tabla_proyectos(conteo_mix=modelo.agrupar(mascara, ["Anio", "Categoria_Proyecto", "Proyecto"], nombre="Registros")),
+        tabla_categorias(conteo=modelo.agrupar(mascara, ["Anio", "Categoria_Proyecto"], nombre="Registros")),
+        productores
+    )
+
+
+if vista["aproximado"]:
+    tablas = exacto_listo(vista, "tablas", calcular_tablas, modelo, mascara)
+else:
+    tablas = calcular_tablas(modelo, mascara)
+
+if tablas is None:
+    # --- Distribución(%) por categoría estimada con la muestra estratificada ---
+    esperar_exacto(vista, "tablas", calcular_tablas, modelo, mascara)
+    st.markdown("### 📋 Distribución(%) por Categoría del Proyecto, por Año (aproximada)")
+    estimado = snapshot.muestra_estratificada.porcentajes(vista["mascara_facetas"], "Anio", "Categoria_Proyecto")
+    texto = estimado["Porcentaje"].map("{:.1f}".format) + " ± " + estimado["error"].map("{:.1f}".format)
+    st.dataframe(texto.unstack(fill_value="0.0 ± 0.0").reset_index(), use_container_width=False)
+else:
+    tabla_final, tabla_pct, tabla_pivote = tablas
+
+    # Mostrar tabla final en Streamlit
+    st.write("")
+
+    st.markdown("### 📋 Número Total de Bitácoras y Distribución(%) por Proyecto y Categoría, por Año")
+    st.dataframe(tabla_final.reset_index(), use_container_width=False, height=min(120, 60* len(tabla_final)))
+
+    # ----------
+
+    st.write("")
+    # --- Tabla de porcentajes por año y categoría del proyecto ---
+    st.markdown("### 📋 Distribución(%) por Categoría del Proyecto, por Año")
+
+    # Mostrar tabla sin scroll horizontal (adaptada al contenido)
+    st.dataframe(tabla_pct, use_container_width=False, height=min(600, 40 * len(tabla_pct)))
+
+    st.write("")
+    # --- Tabla pivote: Número único de productores por género, proyecto y año ---
+    if tabla_pivote is not None:
+        st.markdown("### 📊 Número Único de Productores(as)")
+        st.write("")
+        st.dataframe(tabla_pivote, use_container_width=True)
+
+st.write("")
+# --- Detalle de bitácoras: paginado, con orden y búsqueda del lado del servidor ---
+st.markdown("### 🔎 Detalle de Bitácoras")
+mostrar_tabla_detalle(datos, datos_filtrados, snapshot.indice_busqueda)
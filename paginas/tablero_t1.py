@@ -0,0 +1,158 @@
+import streamlit as st
+
+from agregaciones import kpis
+from datos import cargar_o_detener
+from graficas import figura_genero, figura_por_anio
+
+# --- Vista del extracto del 1er trimestre, montada como página del mismo servidor ---
+# Trae sus propios filtros; la página principal no dibuja los suyos cuando esta vista está activa
+snapshot = cargar_o_detener("2025_T1")
+datos = snapshot.datos
+
+# --- Mostrar encabezado con imágenes ---
+col1, col2, col3 = st.columns([1, 4, 1])
+
+with col1:
+    st.image("assets/cimmyt.png", use_container_width=True)
+
+with col3:
+    st.image("assets/ea.png", use_container_width=True)
+
+# --- Sidebar de filtros encadenados ---
+st.sidebar.header(" 🔽 Filtros")
+
+if 'limpiar_filtros' not in st.session_state:
+    st.session_state.limpiar_filtros = False
+
+select_all = st.sidebar.checkbox("✅ Seleccionar todas las opciones", value=False)
+
+# Función auxiliar para manejar checkboxes múltiples
+def checkbox_list(label, opciones, prefix):
+    seleccionadas = []
+    for o in opciones:
+        default_value = select_all if not st.session_state.limpiar_filtros else False
+        key_name = f"t1_{prefix}_{str(o)}"
+        if st.checkbox(str(o), value=default_value, key=key_name):
+            seleccionadas.append(o)
+    return seleccionadas
+
+# Inicializar con todos los datos (sin copia: la vista nunca modifica el snapshot compartido)
+datos_filtrados = datos
+
+# Filtro por Categoría del Proyecto y Proyecto
+with st.sidebar.expander("Categoría del Proyecto"):
+    categorias = sorted(datos_filtrados["Categoria_Proyecto"].unique())
+    categoria_seleccionada = st.selectbox("Selecciona una categoría", ["Todas"] + categorias)
+
+    if categoria_seleccionada != "Todas":
+        datos_filtrados = datos_filtrados[datos_filtrados["Categoria_Proyecto"] == categoria_seleccionada]
+        proyectos = sorted(datos_filtrados["Proyecto"].unique())
+        seleccionar_todos_proyectos = st.checkbox("Seleccionar todos los proyectos")
+
+        proyectos_seleccionados = []
+        for proyecto in proyectos:
+            valor_default = seleccionar_todos_proyectos if not st.session_state.limpiar_filtros else False
+            key_name = f"t1_proyecto_{str(proyecto)}"
+            if st.checkbox(str(proyecto), value=valor_default, key=key_name):
+                proyectos_seleccionados.append(proyecto)
+
+        if proyectos_seleccionados:
+            datos_filtrados = datos_filtrados[datos_filtrados["Proyecto"].isin(proyectos_seleccionados)]
+
+# Filtro por Ciclo
+with st.sidebar.expander("Ciclo"):
+    ciclos = sorted(datos_filtrados["Ciclo"].unique())
+    seleccion_ciclos = checkbox_list("Ciclo", ciclos, "ciclo")
+    if seleccion_ciclos:
+        datos_filtrados = datos_filtrados[datos_filtrados["Ciclo"].isin(seleccion_ciclos)]
+
+# Filtro por Tipo de Parcela
+with st.sidebar.expander("Tipo de Parcela"):
+    tipos_parcela = sorted(datos_filtrados["Tipo_parcela"].unique())
+    seleccion_tipos_parcela = checkbox_list("Tipo Parcela", tipos_parcela, "parcela")
+    if seleccion_tipos_parcela:
+        datos_filtrados = datos_filtrados[datos_filtrados["Tipo_parcela"].isin(seleccion_tipos_parcela)]
+
+# Filtro por Estado
+with st.sidebar.expander("Estado"):
+    estados = sorted(datos_filtrados["Estado"].unique())
+    seleccion_estados = checkbox_list("Estado", estados, "estado")
+    if seleccion_estados:
+        datos_filtrados = datos_filtrados[datos_filtrados["Estado"].isin(seleccion_estados)]
+
+# Filtro por Régimen Hídrico
+with st.sidebar.expander("Régimen Hídrico"):
+    regimenes = sorted(datos_filtrados["Tipo_Regimen_Hidrico"].unique())
+    seleccion_regimen = checkbox_list("Régimen", regimenes, "regimen")
+    if seleccion_regimen:
+        datos_filtrados = datos_filtrados[datos_filtrados["Tipo_Regimen_Hidrico"].isin(seleccion_regimen)]
+
+# Resetear estado después de aplicar filtros
+if st.session_state.limpiar_filtros:
+    st.session_state.limpiar_filtros = False
+
+
+# --- Título Principal ---
+st.title("🌾 Dashboard Bitácoras Agronómicas 2012-2025")
+
+if datos_filtrados.empty:
+    st.warning("⚠️ No hay datos disponibles para los filtros seleccionados. Selecciona al menos una opción en los filtros.")
+    st.stop()
+
+# --- KPIs ---
+totales = kpis(datos_filtrados)
+col1, col2, col3, col4 = st.columns(4)
+
+with col1:
+    st.metric(
+        label="Bitácoras Registradas",
+        value=f"{totales['bitacoras']:,}"
+    )
+
+with col2:
+    st.metric(
+        label="Área Total (ha)",
+        value=f"{totales['area']:,.2f} ha"
+    )
+
+with col3:
+    if "Id_Productor" in datos_filtrados.columns:
+        st.metric(
+            label="Productores",
+            value=f"{totales['productores']:,}"
+        )
+
+with col4:
+    if "Id_Parcela(Unico)" in datos_filtrados.columns:
+        st.metric(
+            label="Parcelas",
+            value=f"{totales['parcelas']:,}"
+        )
+
+st.markdown("---")
+
+# --- Gráficas principales ---
+por_tipo = bool(seleccion_tipos_parcela)
+col5, col6 = st.columns(2)
+
+with col5:
+    st.plotly_chart(figura_por_anio(datos_filtrados, "bitacoras", por_tipo), use_container_width=True)
+
+with col6:
+    st.plotly_chart(figura_por_anio(datos_filtrados, "area", por_tipo), use_container_width=True)
+
+col7, col8 = st.columns(2)
+
+with col7:
+    if "Id_Parcela(Unico)" in datos_filtrados.columns:
+        st.plotly_chart(figura_por_anio(datos_filtrados, "parcelas", por_tipo), use_container_width=True)
+
+with col8:
+    if "Id_Productor" in datos_filtrados.columns:
+        st.plotly_chart(figura_por_anio(datos_filtrados, "productores", por_tipo), use_container_width=True)
+
+# Distribución por género
+if "Genero" in datos_filtrados.columns:
+    st.markdown("---")
+    fig_genero = figura_genero(datos_filtrados, "👩👨 Distribución de productores(as) por Género", textinfo="value")
+    st.plotly_chart(fig_genero, use_container_width=True)
@@ -0,0 +1,164 @@
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from sklearn.cluster import DBSCAN
+from sklearn.neighbors import BallTree
+
+
+RADIO_TIERRA_KM = 6371.0088
+TIPO_MODULO = "Módulo"
+TIPOS_CERCANOS = ["Área de extensión", "Área de Impacto"]
+RUIDO = -1
+
+
+def distancia_km(lat1, lon1, lat2, lon2):
+    """Distancia haversine en km entre pares de puntos en grados"""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * RADIO_TIERRA_KM * np.arcsin(np.sqrt(a))
+
+
+class IndiceEspacial:
+    """BallTree con métrica haversine sobre la ubicación de cada parcela.
+
+    Se construye una vez por snapshot con un punto por `Id_Parcela(Unico)` (su última
+    ubicación registrada). Las consultas reciben las posiciones de las parcelas que
+    pasan el filtro activo, de modo que el árbol no se reconstruye al cambiar filtros.
+    """
+
+    def __init__(self, datos):
+        parcelas = (
+            datos.dropna(subset=["Latitud", "Longitud"])
+            .drop_duplicates("Id_Parcela(Unico)", keep="last")
+            [["Id_Parcela(Unico)", "Latitud", "Longitud", "Tipo_parcela", "HUB_Agroecológico"]]
+            .reset_index(drop=True)
+        )
+        self.parcelas = parcelas
+        self.ids = pd.Index(parcelas["Id_Parcela(Unico)"])
+        self.coordenadas = np.radians(parcelas[["Latitud", "Longitud"]].to_numpy(dtype=np.float64))
+        self.tipos = pd.Index([TIPO_MODULO] + TIPOS_CERCANOS)
+        self.codigo_tipo = self.tipos.get_indexer(parcelas["Tipo_parcela"])
+        self.arbol = BallTree(self.coordenadas, metric="haversine")
+
+    # El árbol no se guarda en el snapshot compartido: se reconstruye al cargarlo
+    def __getstate__(self):
+        return {k: v for k, v in self.__dict__.items() if k != "arbol"}
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.arbol = BallTree(self.coordenadas, metric="haversine")
+
+    def posiciones(self, datos_filtrados):
+        """Posiciones en el índice de las parcelas presentes en la selección"""
+        posiciones = self.ids.get_indexer(datos_filtrados["Id_Parcela(Unico)"].unique())
+        return np.sort(posiciones[posiciones >= 0])
+
+    def conteos_en_radio(self, posiciones, radio_km):
+        """Parcelas de extensión e impacto a menos de `radio_km` de cada Módulo de la selección"""
+        en_seleccion = np.zeros(len(self.ids), dtype=bool)
+        en_seleccion[posiciones] = True
+        modulos = posiciones[self.codigo_tipo[posiciones] == 0]
+
+        vecinos = self.arbol.query_radius(self.coordenadas[modulos], r=radio_km / RADIO_TIERRA_KM) if len(modulos) else []
+        longitudes = np.array([len(v) for v in vecinos], dtype=np.int64)
+        todos = np.concatenate(vecinos) if len(vecinos) else np.array([], dtype=np.int64)
+        dueno = np.repeat(np.arange(len(modulos)), longitudes)
+
+        validos = en_seleccion[todos] & (self.codigo_tipo[todos] > 0)
+        conteos = np.bincount(
+            dueno[validos] * len(self.tipos) + self.codigo_tipo[todos[validos]],
+            minlength=len(modulos) * len(self.tipos)
+        ).reshape(len(modulos), len(self.tipos))
+
+        resultado = self.parcelas.iloc[modulos][["Id_Parcela(Unico)", "HUB_Agroecológico", "Latitud", "Longitud"]].reset_index(drop=True)
+        for i, tipo in enumerate(TIPOS_CERCANOS, start=1):
+            resultado[tipo] = conteos[:, i]
+        resultado["Total cercanas"] = conteos[:, 1:].sum(axis=1)
+        return resultado.sort_values("Total cercanas", ascending=False, ignore_index=True)
+
+    def modulo_mas_cercano(self, posiciones):
+        """Asigna cada parcela de la selección al Módulo seleccionado más cercano"""
+        modulos = posiciones[self.codigo_tipo[posiciones] == 0]
+        otras = posiciones[self.codigo_tipo[posiciones] != 0]
+        if not len(modulos) or not len(otras):
+            return pd.DataFrame(columns=["Id_Parcela(Unico)", "Tipo_parcela", "Módulo más cercano", "Distancia (km)"])
+
+        # Los módulos de la selección son pocos: su árbol se construye en O(m log m)
+        arbol_modulos = BallTree(self.coordenadas[modulos], metric="haversine")
+        distancias, indices = arbol_modulos.query(self.coordenadas[otras], k=1)
+        return pd.DataFrame({
+            "Id_Parcela(Unico)": self.ids[otras],
+            "Tipo_parcela": self.parcelas["Tipo_parcela"].to_numpy()[otras],
+            "Módulo más cercano": self.ids[modulos[indices[:, 0]]],
+            "Distancia (km)": distancias[:, 0] * RADIO_TIERRA_KM,
+        })
+
+    def focos(self, posiciones, radio_km, minimo_parcelas, tipo=None):
+        """Focos de concentración (DBSCAN con distancia haversine) entre las parcelas de la selección.
+
+        Los vecindarios salen del árbol del snapshot con `query_radius` y se le pasan a
+        DBSCAN como grafo disperso de distancias, así que el costo es O(n log n) más el
+        número de pares cercanos. Regresa las posiciones agrupadas y la etiqueta de foco
+        de cada una (RUIDO si no pertenece a ninguno).
+        """
+        if tipo is not None:
+            posiciones = posiciones[self.codigo_tipo[posiciones] == self.tipos.get_loc(tipo)]
+        if not len(posiciones):
+            return posiciones, np.array([], dtype=np.int64)
+
+        local = np.full(len(self.ids), -1, dtype=np.int64)
+        local[posiciones] = np.arange(len(posiciones))
+        radio = radio_km / RADIO_TIERRA_KM
+        vecinos, distancias = self.arbol.query_radius(self.coordenadas[posiciones], r=radio, return_distance=True)
+
+        columnas = local[np.concatenate(vecinos)]
+        filas = np.repeat(np.arange(len(posiciones)), [len(v) for v in vecinos])
+        validos = columnas >= 0
+        grafo = csr_matrix(
+            (np.concatenate(distancias)[validos], (filas[validos], columnas[validos])),
+            shape=(len(posiciones), len(posiciones))
+        )
+        etiquetas = DBSCAN(eps=radio, min_samples=minimo_parcelas, metric="precomputed").fit_predict(grafo)
+        return posiciones, etiquetas
+
+    def puntos_focos(self, posiciones, etiquetas):
+        """Parcelas que pertenecen a algún foco, con su etiqueta"""
+        agrupadas = etiquetas != RUIDO
+        puntos = self.parcelas.iloc[posiciones[agrupadas]].reset_index(drop=True)
+        puntos["Foco"] = etiquetas[agrupadas] + 1
+        return puntos
+
+    def resumen_focos(self, posiciones, etiquetas):
+        """Una fila por foco: parcelas por tipo, centro, radio y HUB más frecuente"""
+        puntos = self.puntos_focos(posiciones, etiquetas)
+        columnas = ["Foco", "Parcelas", *self.tipos, "HUB más frecuente", "Latitud", "Longitud", "Radio (km)"]
+        if puntos.empty:
+            return pd.DataFrame(columns=columnas)
+
+        agrupado = puntos.groupby("Foco")
+        resumen = agrupado.agg(
+            Parcelas=("Id_Parcela(Unico)", "size"),
+            Latitud=("Latitud", "mean"),
+            Longitud=("Longitud", "mean"),
+        )
+        por_tipo = pd.crosstab(puntos["Foco"], puntos["Tipo_parcela"].astype(str))
+        resumen = resumen.join(por_tipo.reindex(columns=self.tipos, fill_value=0))
+        resumen["HUB más frecuente"] = agrupado["HUB_Agroecológico"].agg(lambda x: x.astype(str).mode().iat[0])
+
+        centro = resumen.loc[puntos["Foco"], ["Latitud", "Longitud"]].to_numpy()
+        distancia = distancia_km(puntos["Latitud"], puntos["Longitud"], centro[:, 0], centro[:, 1])
+        resumen["Radio (km)"] = distancia.groupby(puntos["Foco"]).max()
+        return resumen.reset_index()[columnas].sort_values("Parcelas", ascending=False, ignore_index=True)
+
+
+def hub_que_contiene(resumen, hubs):
+    """Nombre del polígono de HUB que contiene el centro de cada foco (vacío si ninguno)"""
+    import geopandas as gpd
+
+    centros = gpd.GeoDataFrame(
+        geometry=gpd.points_from_xy(resumen["Longitud"], resumen["Latitud"]),
+        index=resumen.index,
+        crs=hubs.crs
+    )
+    unidos = gpd.sjoin(centros, hubs[["Nombre", "geometry"]], how="left", predicate="within")
+    return unidos.groupby(level=0)["Nombre"].first().reindex(resumen.index).fillna("")
@@ -0,0 +1,230 @@
+"""Prueba de carga del tablero con sesiones simuladas, sin servidor, navegador ni red.
+
+Cada sesión es un `AppTest` de Streamlit que recorre un guion de interacciones
+(años, HUBs, cultivos, páginas, zoom y límite de HUB del mapa) y mide lo que tarda
+cada re-ejecución. Las sesiones se reparten en procesos y, dentro de cada proceso,
+en hilos que comparten los cachés igual que en un servidor real:
+
+    python prueba_carga.py --sesiones 20 --procesos 2 --pasos 30 --p95-max 3
+"""
+import argparse
+import os
+import random
+import resource
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import get_context
+
+import numpy as np
+import pandas as pd
+
+
+APP = os.path.join(os.path.dirname(os.path.abspath(__file__)), "streamlit_app.py")
+PAGINAS = [
+    "paginas/resumen.py", "paginas/genero.py", "paginas/comparacion.py", "paginas/tablas.py",
+    "paginas/distribucion.py", "paginas/mapas.py", "paginas/cobertura.py", "paginas/proximidad.py",
+    "paginas/tablero_t1.py",
+]
+PERCENTILES = (50, 95, 99)
+TIEMPO_LIMITE_S = 120
+
+
+# --- Acciones del guion: cada una modifica un widget y regresa su nombre, o None si no aplica ---
+def _alternar_casilla(app, azar, prefijo):
+    casillas = [c for c in app.checkbox if c.key and c.key.startswith(f"{prefijo}_")]
+    if casillas:
+        casilla = azar.choice(casillas)
+        casilla.set_value(not casilla.value)
+        return f"alternar_{prefijo}"
+    # Facetas largas usan un multiselect en lugar de casillas
+    seleccion = [m for m in app.multiselect if m.key == f"{prefijo}_multiselect"]
+    if seleccion and seleccion[0].options:
+        opcion = azar.choice(seleccion[0].options)
+        valor = [v for v in seleccion[0].value if v != opcion] if opcion in seleccion[0].value else seleccion[0].value + [opcion]
+        seleccion[0].set_value(valor)
+        return f"alternar_{prefijo}"
+    return None
+
+
+def alternar_anio(app, azar):
+    return _alternar_casilla(app, azar, "anio")
+
+
+def alternar_hub(app, azar):
+    return _alternar_casilla(app, azar, "hub")
+
+
+def alternar_cultivo(app, azar):
+    return _alternar_casilla(app, azar, "cultivo")
+
+
+def cambiar_pagina(app, azar):
+    app.switch_page(azar.choice(PAGINAS))
+    return "cambiar_pagina"
+
+
+def mover_zoom(app, azar):
+    zoom = [s for s in app.slider if s.key == "mapas_zoom"]
+    if not zoom:
+        app.switch_page("paginas/mapas.py")
+        return "cambiar_pagina"
+    zoom[0].set_value(azar.randint(4, 12))
+    return "mover_zoom"
+
+
+def cambiar_hub_mapa(app, azar):
+    hub = [s for s in app.selectbox if s.key == "hub_seleccionado"]
+    if not hub:
+        app.switch_page("paginas/mapas.py")
+        return "cambiar_pagina"
+    hub[0].set_value(azar.choice(hub[0].options))
+    return "hub_seleccionado"
+
+
+# Peso de cada acción en un guion típico
+GUION = {
+    alternar_anio: 3,
+    alternar_hub: 3,
+    alternar_cultivo: 2,
+    cambiar_pagina: 2,
+    mover_zoom: 1,
+    cambiar_hub_mapa: 1,
+}
+
+
+def _ejecutar(app, registros, sesion, accion):
+    inicio = time.perf_counter()
+    app.run(timeout=TIEMPO_LIMITE_S)
+    latencia = time.perf_counter() - inicio
+    errores = [e.value for e in app.exception]
+    registros.append({
+        "sesion": sesion,
+        "accion": accion,
+        "latencia_s": latencia,
+        "error": str(errores[0])[:200] if errores else "",
+    })
+
+
+def simular_sesion(sesion, pasos, pausa_s, semilla):
+    """Una sesión completa: carga inicial y `pasos` interacciones del guion"""
+    from streamlit.testing.v1 import AppTest
+
+    azar = random.Random(semilla + sesion)
+    acciones, pesos = list(GUION), list(GUION.values())
+    registros = []
+    app = AppTest.from_file(APP, default_timeout=TIEMPO_LIMITE_S)
+    _ejecutar(app, registros, sesion, "carga_inicial")
+    for _ in range(pasos):
+        time.sleep(azar.uniform(0, 2 * pausa_s))  # tiempo de lectura del usuario
+        accion = azar.choices(acciones, weights=pesos)[0](app, azar)
+        if accion is not None:
+            _ejecutar(app, registros, sesion, accion)
+    return registros
+
+
+def _memoria_mb():
+    """RSS actual y máximo del proceso en MB"""
+    with open("/proc/self/statm") as archivo:
+        actual = int(archivo.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    maximo = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KB en Linux
+    return actual / 2**20, maximo / 2**20
+
+
+def trabajador(proceso, sesiones, pasos, pausa_s, semilla):
+    """Corre sus sesiones en hilos concurrentes y reporta latencias y memoria del proceso"""
+    os.chdir(os.path.dirname(APP))
+    sys.path.insert(0, os.path.dirname(APP))
+    memoria_base, _ = _memoria_mb()
+    muestras = []
+    detener = threading.Event()
+
+    def muestrear():
+        while not detener.wait(0.5):
+            muestras.append(_memoria_mb()[0])
+
+    hilo = threading.Thread(target=muestrear, daemon=True)
+    hilo.start()
+    with ThreadPoolExecutor(max_workers=len(sesiones)) as hilos:
+        resultados = list(hilos.map(lambda s: simular_sesion(s, pasos, pausa_s, semilla), sesiones))
+    detener.set()
+
+    actual, maximo = _memoria_mb()
+    registros = [r for resultado in resultados for r in resultado]
+    for registro in registros:
+        registro["proceso"] = proceso
+    memoria = {
+        "proceso": proceso,
+        "sesiones": len(sesiones),
+        "RSS inicial (MB)": memoria_base,
+        "RSS promedio (MB)": float(np.mean(muestras)) if muestras else actual,
+        "RSS final (MB)": actual,
+        "RSS máximo (MB)": maximo,
+    }
+    return registros, memoria
+
+
+def resumen_latencias(registros):
+    """Percentiles de latencia por acción y en total"""
+    def fila(grupo):
+        latencias = grupo["latencia_s"].to_numpy()
+        valores = np.percentile(latencias, PERCENTILES)
+        datos = {"re-ejecuciones": len(latencias), "errores": int((grupo["error"] != "").sum())}
+        datos.update({f"p{p} (s)": v for p, v in zip(PERCENTILES, valores)})
+        datos["máximo (s)"] = latencias.max()
+        return pd.Series(datos)
+
+    por_accion = registros.groupby("accion").apply(fila)
+    por_accion.loc["TOTAL"] = fila(registros)
+    return por_accion
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prueba de carga del tablero con sesiones simuladas (sin red)")
+    parser.add_argument("--sesiones", type=int, default=10, help="Sesiones simultáneas en total")
+    parser.add_argument("--procesos", type=int, default=1, help="Procesos servidores simulados")
+    parser.add_argument("--pasos", type=int, default=20, help="Interacciones por sesión")
+    parser.add_argument("--pausa", type=float, default=1.0, help="Pausa promedio entre interacciones (s)")
+    parser.add_argument("--semilla", type=int, default=0)
+    parser.add_argument("--p95-max", type=float, default=None, help="Falla (código 1) si el p95 total lo rebasa (s)")
+    parser.add_argument("--csv", default=None, help="Guarda cada re-ejecución medida en este CSV")
+    args = parser.parse_args()
+
+    repartos = [list(range(args.sesiones))[i::args.procesos] for i in range(args.procesos)]
+    inicio = time.perf_counter()
+    # "spawn": cada proceso arranca limpio, así su memoria es la de un servidor nuevo
+    with ProcessPoolExecutor(max_workers=args.procesos, mp_context=get_context("spawn")) as procesos:
+        resultados = list(procesos.map(
+            trabajador, range(args.procesos), repartos,
+            [args.pasos] * args.procesos, [args.pausa] * args.procesos, [args.semilla] * args.procesos
+        ))
+    duracion = time.perf_counter() - inicio
+
+    registros = pd.DataFrame([r for registros, _ in resultados for r in registros])
+    memoria = pd.DataFrame([m for _, m in resultados])
+    latencias = resumen_latencias(registros)
+
+    pd.set_option("display.width", 160)
+    print(f"\n{args.sesiones} sesiones en {args.procesos} proceso(s), {len(registros):,} re-ejecuciones en {duracion:.1f} s")
+    print(f"Throughput: {len(registros) / duracion:.2f} re-ejecuciones/s\n")
+    print(latencias.round(3).to_string())
+    print()
+    print(memoria.round(1).to_string(index=False))
+
+    errores = registros[registros["error"] != ""]
+    if not errores.empty:
+        print(f"\n⚠️ {len(errores)} re-ejecuciones con excepción; primera: {errores['error'].iat[0]}")
+    if args.csv:
+        registros.to_csv(args.csv, index=False)
+
+    p95 = latencias.loc["TOTAL", "p95 (s)"]
+    if args.p95_max is not None and p95 > args.p95_max:
+        print(f"\n❌ p95 de {p95:.3f} s rebasa el límite de {args.p95_max} s")
+        sys.exit(1)
+    if not errores.empty:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
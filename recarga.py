@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger(__name__)
+
+INTERVALO_REVISION_S = 30
+
+
+class Recargador:
+    """Vigila las fuentes de datos y publica snapshots nuevos fuera del camino de las peticiones.
+
+    Las sesiones siempre leen el snapshot activo de una fuente; el hilo de fondo construye
+    el siguiente (datos, índices y agregados) y solo al terminar lo intercambia en una sola
+    asignación protegida por candado. Un archivo que sigue cambiando entre dos revisiones
+    o que falla al cargarse nunca reemplaza al snapshot activo.
+    """
+
+    def __init__(self, version, construir, claves=(), intervalo=INTERVALO_REVISION_S):
+        self._version = version
+        self._construir = construir
+        self._claves = list(claves)
+        self._intervalo = intervalo
+        self._activos = {}
+        self._candado = threading.Lock()
+        self._candados_clave = {clave: threading.Lock() for clave in self._claves}
+        self._pendientes = {}
+        self._hilo = threading.Thread(target=self._vigilar, name="recarga-snapshots", daemon=True)
+
+    def iniciar(self):
+        self._hilo.start()
+        return self
+
+    def activo(self, clave):
+        """Snapshot publicado de `clave`; si aún no existe se construye una sola vez"""
+        with self._candado:
+            snapshot = self._activos.get(clave)
+            candado_clave = self._candados_clave.setdefault(clave, threading.Lock())
+        if snapshot is not None:
+            return snapshot
+        with candado_clave:
+            with self._candado:
+                snapshot = self._activos.get(clave)
+            if snapshot is None:
+                snapshot = self._construir(clave, self._version(clave))
+                self._publicar(clave, snapshot)
+            return snapshot
+
+    def _publicar(self, clave, snapshot):
+        with self._candado:
+            self._activos[clave] = snapshot
+
+    def _revisar(self, clave):
+        try:
+            version = self._version(clave)
+        except OSError:
+            return
+        with self._candado:
+            actual = self._activos.get(clave)
+        if actual is not None and actual.version == version:
+            self._pendientes.pop(clave, None)
+            return
+        # Se espera a ver la misma versión en dos revisiones seguidas (archivo terminado de copiar)
+        if actual is not None and self._pendientes.get(clave) != version:
+            self._pendientes[clave] = version
+            return
+        with self._candados_clave.setdefault(clave, threading.Lock()):
+            # En un arranque en frío `activo()` pudo publicar esta versión mientras se esperaba
+            with self._candado:
+                actual = self._activos.get(clave)
+            if actual is not None and actual.version == version:
+                self._pendientes.pop(clave, None)
+                return
+            inicio = time.monotonic()
+            try:
+                nuevo = self._construir(clave, version)
+            except Exception:
+                logger.exception("No se pudo construir el snapshot de %s; se conserva el activo", clave)
+                return
+            self._publicar(clave, nuevo)
+        self._pendientes.pop(clave, None)
+        logger.info("Snapshot de %s actualizado en %.1f s", clave, time.monotonic() - inicio)
+
+    def _vigilar(self):
+        while True:
+            # Un error inesperado no debe terminar el hilo: la recarga se detendría para siempre
+            try:
+                with self._candado:
+                    claves = set(self._claves) | set(self._activos)
+                for clave in claves:
+                    self._revisar(clave)
+            except Exception:
+                logger.exception("Error al revisar los snapshots; se reintenta en la siguiente revisión")
+            time.sleep(self._intervalo)
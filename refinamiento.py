@@ -0,0 +1,83 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import streamlit as st
+
+
+logger = logging.getLogger(__name__)
+
+
+# --- La selección debe quedarse quieta este tiempo antes de lanzar el cálculo exacto ---
+ESPERA_S = 1.5
+INTERVALO_REVISION_S = 1.0
+MAXIMO_TRABAJOS = 64
+
+
+@st.cache_resource(show_spinner=False)
+def _trabajos():
+    # Un ejecutor por servidor; los resultados se comparten entre sesiones con la misma selección.
+    # Los cálculos que fallaron se recuerdan aparte para no relanzarlos en cada ejecución.
+    return ThreadPoolExecutor(max_workers=2, thread_name_prefix="calculo-exacto"), {}, {}, threading.Lock()
+
+
+def _clave(vista, nombre):
+    snapshot = vista["snapshot"]
+    return (snapshot.clave, snapshot.version, vista["clave_filtro"], nombre)
+
+
+def _recortar(trabajos):
+    while len(trabajos) > MAXIMO_TRABAJOS:
+        trabajos.pop(next(iter(trabajos)))
+
+
+def exacto_listo(vista, nombre, funcion, *args):
+    """Resultado exacto si ya terminó, si no None (también si el cálculo falló).
+
+    El cálculo se lanza en segundo plano solo cuando la selección lleva `ESPERA_S`
+    sin cambiar, para no gastar trabajo en selecciones que el usuario ya dejó atrás.
+    """
+    ejecutor, trabajos, fallidos, candado = _trabajos()
+    clave = _clave(vista, nombre)
+    with candado:
+        if clave in fallidos:
+            return None
+        futuro = trabajos.get(clave)
+        if futuro is None and time.monotonic() - vista["cambio_filtro"] >= ESPERA_S:
+            futuro = trabajos[clave] = ejecutor.submit(funcion, *args)
+            _recortar(trabajos)
+    if futuro is None or not futuro.done():
+        return None
+    error = futuro.exception()
+    if error is None:
+        return futuro.result()
+    with candado:
+        if trabajos.get(clave) is futuro:
+            del trabajos[clave]
+            fallidos[clave] = error
+            _recortar(fallidos)
+            logger.error("Falló el cálculo exacto de %s", nombre, exc_info=error)
+    return None
+
+
+def exacto_fallido(vista, nombre):
+    """True si el cálculo exacto de esta selección falló; la página se queda con la estimación"""
+    _, _, fallidos, candado = _trabajos()
+    with candado:
+        return _clave(vista, nombre) in fallidos
+
+
+def esperar_exacto(vista, nombre, funcion, *args):
+    """Aviso que se revisa solo cada segundo y recarga la página cuando el resultado exacto está listo"""
+    if exacto_fallido(vista, nombre):
+        st.warning("⚠️ No se pudo completar el cálculo exacto; se muestran los valores aproximados.")
+        return
+
+    @st.fragment(run_every=INTERVALO_REVISION_S)
+    def pendiente():
+        if exacto_listo(vista, nombre, funcion, *args) is not None or exacto_fallido(vista, nombre):
+            st.rerun()
+        st.caption("⏳ Valores aproximados con intervalo de confianza al 95%; calculando los exactos…")
+
+    pendiente()
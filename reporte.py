@@ -0,0 +1,178 @@
+"""Reporte estático por HUB con las gráficas y mapas del tablero.
+
+Genera, sin navegador ni red, un HTML autocontenido (imágenes PNG incrustadas)
+y un PDF por figura para cada HUB, empaquetados en un ZIP por HUB:
+
+    python reporte.py --extracto 2025_T2 --salida reportes/2025_T2
+"""
+import argparse
+import base64
+import html
+import os
+import re
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+
+import plotly.io as pio
+
+from agregaciones import METRICAS_ANIO, kpis
+from cobertura import leer_hubs, poligonos_de_hub
+from datos import FUENTE_PREDETERMINADA, FUENTES, leer_fuente, preprocesar
+from figuras_mapa import ESTILO_SIN_RED, agregar_hubs, crear_figura, figura_estados
+from graficas import color_map_parcela, figura_genero, figura_genero_anio, figura_por_anio
+from normalizacion import normalizar_texto
+
+
+TODOS = "Todos"
+FORMATOS = ("png", "pdf")
+
+# --- Tamaño de exportación para figuras que no fijan el suyo ---
+ANCHO = 1000
+ALTO = 600
+ESCALA = 2
+
+
+def nombre_archivo(texto):
+    """Nombre de archivo seguro a partir del nombre de un HUB"""
+    return re.sub(r"[^a-z0-9]+", "_", normalizar_texto(str(texto)).lower()).strip("_") or "sin_nombre"
+
+
+def figuras_hub(datos_hub, hubs=None):
+    """Las mismas figuras del tablero para las bitácoras de un HUB, en orden de aparición"""
+    figuras = {
+        f"anio_{metrica}": figura_por_anio(datos_hub, metrica, True, color_map_parcela, bordes=True)
+        for metrica in METRICAS_ANIO
+    }
+    if "Genero" in datos_hub.columns:
+        figuras["genero"] = figura_genero(datos_hub, "👩👨 Distribución Total de Productores(as) por Género")
+        figuras["genero_anio"] = figura_genero_anio(datos_hub)
+
+    # Mapas sin teselas: el fondo "white-bg" no descarga nada
+    mapa = crear_figura(datos_hub, estilo=ESTILO_SIN_RED)
+    if hubs is not None:
+        agregar_hubs(mapa, hubs)
+    figuras["mapa_parcelas"] = mapa
+    figuras["mapa_estados"] = figura_estados(datos_hub, estilo=ESTILO_SIN_RED)
+    return figuras
+
+
+# --- Trabajadores de exportación: cada proceso mantiene su propio Kaleido ---
+def _iniciar_trabajador():
+    pio.kaleido.scope.mathjax = None  # evita que Kaleido intente descargar MathJax
+
+
+def _exportar(tarea):
+    figura_json, ruta, formato = tarea
+    figura = pio.from_json(figura_json)
+    figura.write_image(
+        ruta,
+        format=formato,
+        width=figura.layout.width or ANCHO,
+        height=figura.layout.height or ALTO,
+        scale=ESCALA if formato == "png" else 1,
+    )
+    return ruta
+
+
+def escribir_html(ruta, titulo, mensaje, totales, pngs):
+    """HTML autocontenido con los KPIs y las figuras incrustadas en base64"""
+    tarjetas = "".join(
+        f"<div class='kpi'><span>{html.escape(etiqueta)}</span><b>{valor}</b></div>"
+        for etiqueta, valor in [
+            ("📋 Total de Bitácoras", f"{totales['bitacoras']:,}"),
+            ("🌿 Área Total (ha)", f"{totales['area']:,.2f}"),
+            ("🌄 Número de Parcelas Totales", f"{totales['parcelas']:,}"),
+            ("👩‍🌾 Productores(as) Totales", f"{totales['productores']:,}"),
+        ]
+    )
+    imagenes = []
+    for png in pngs:
+        with open(png, "rb") as f:
+            codificada = base64.b64encode(f.read()).decode("ascii")
+        imagenes.append(f"<img src='data:image/png;base64,{codificada}' alt='{html.escape(os.path.basename(png))}'>")
+
+    with open(ruta, "w", encoding="utf-8") as f:
+        f.write(
+            "<!DOCTYPE html><html lang='es'><head><meta charset='utf-8'>"
+            f"<title>{html.escape(titulo)}</title>"
+            "<style>body{font-family:sans-serif;margin:2em}.kpis{display:flex;gap:1em}"
+            ".kpi{border:1px solid #ccc;border-radius:6px;padding:.8em;flex:1}.kpi span{display:block;color:#555}"
+            ".kpi b{font-size:1.6em}img{max-width:100%;display:block;margin:2em auto}</style></head><body>"
+            f"<h1>{html.escape(titulo)}</h1><p>{html.escape(mensaje)}</p>"
+            f"<div class='kpis'>{tarjetas}</div>{''.join(imagenes)}</body></html>"
+        )
+
+
+def generar(clave, salida, hubs_elegidos=None, anios=None, trabajadores=None):
+    """Construye y exporta el reporte de cada HUB; regresa la ruta de cada ZIP generado"""
+    fuente = FUENTES[clave]
+    datos, _, _ = preprocesar(leer_fuente(clave))
+    if anios:
+        datos = datos[datos["Anio"].isin(anios)]
+    try:
+        poligonos = leer_hubs()
+    except OSError:
+        poligonos = None
+
+    columna_hub = "HUB_Agroecológico"
+    disponibles = [TODOS] + [str(h) for h in datos[columna_hub].dropna().unique()] if columna_hub in datos.columns else [TODOS]
+    hubs_elegidos = hubs_elegidos or disponibles
+    desconocidos = set(hubs_elegidos) - set(disponibles)
+    if desconocidos:
+        raise ValueError(f"HUBs sin bitácoras en el extracto: {', '.join(sorted(desconocidos))}")
+
+    # Las figuras se arman aquí; solo la exportación (lo costoso) va a los trabajadores
+    reportes = {}
+    tareas = []
+    for hub in hubs_elegidos:
+        datos_hub = datos if hub == TODOS else datos[datos[columna_hub].astype(str) == hub]
+        carpeta = os.path.join(salida, nombre_archivo(hub))
+        os.makedirs(carpeta, exist_ok=True)
+        archivos = {formato: [] for formato in FORMATOS}
+        # Cada reporte dibuja solo el polígono de su HUB; el total los dibuja todos
+        poligonos_hub = poligonos
+        if poligonos is not None and hub != TODOS:
+            poligonos_hub = poligonos_de_hub(poligonos, hub)
+            if poligonos_hub.empty:
+                print(f"  Sin polígono para el HUB '{hub}'; el mapa se genera sin límites de HUB")
+        for nombre, figura in figuras_hub(datos_hub, poligonos_hub).items():
+            figura_json = figura.to_json()
+            for formato in FORMATOS:
+                ruta = os.path.join(carpeta, f"{nombre}.{formato}")
+                archivos[formato].append(ruta)
+                tareas.append((figura_json, ruta, formato))
+        reportes[hub] = (carpeta, datos_hub, archivos)
+
+    with ProcessPoolExecutor(max_workers=trabajadores, initializer=_iniciar_trabajador) as pool:
+        for ruta in pool.map(_exportar, tareas):
+            print(f"  {ruta}")
+
+    zips = []
+    for hub, (carpeta, datos_hub, archivos) in reportes.items():
+        ruta_html = os.path.join(carpeta, "reporte.html")
+        titulo = f"Reporte {fuente['nombre']} – {'Todos los HUBs' if hub == TODOS else hub}"
+        escribir_html(ruta_html, titulo, fuente["mensaje"], kpis(datos_hub), archivos["png"])
+
+        ruta_zip = f"{carpeta}.zip"
+        with zipfile.ZipFile(ruta_zip, "w", zipfile.ZIP_DEFLATED) as z:
+            for ruta in [ruta_html] + archivos["pdf"]:
+                z.write(ruta, arcname=os.path.relpath(ruta, salida))
+        zips.append(ruta_zip)
+    return zips
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reporte estático por HUB (HTML y PDF) sin navegador ni red")
+    parser.add_argument("--extracto", default=FUENTE_PREDETERMINADA, choices=list(FUENTES))
+    parser.add_argument("--salida", default="reportes")
+    parser.add_argument("--hub", action="append", dest="hubs", help=f"HUB a incluir (repetible); '{TODOS}' para el total")
+    parser.add_argument("--anio", action="append", dest="anios", type=int, help="Año a incluir (repetible)")
+    parser.add_argument("--trabajadores", type=int, default=None, help="Procesos de exportación (por omisión, uno por CPU)")
+    args = parser.parse_args()
+
+    for ruta_zip in generar(args.extracto, args.salida, args.hubs, args.anios, args.trabajadores):
+        print(ruta_zip)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+import bisect
+import math
+import unicodedata
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+
+# --- Columnas sobre las que se construye el índice de búsqueda ---
+COLUMNAS_BUSQUEDA = ["Proyecto", "Cultivo(s)", "Id_Productor"]
+
+# --- Columnas visibles por defecto en la tabla de detalle ---
+COLUMNAS_DETALLE = [
+    "Anio", "Ciclo", "HUB_Agroecológico", "Estado", "Categoria_Proyecto", "Proyecto",
+    "Id_Productor", "Id_Parcela(Unico)", "Tipo_parcela", "Cultivo(s)", "Area_total_de_la_parcela(ha)"
+]
+
+TAMANO_NGRAMA = 3
+FILAS_POR_PAGINA = [25, 50, 100, 250]
+
+
+def clave_busqueda(texto):
+    """Convierte un valor a minúsculas y sin acentos para compararlo en la búsqueda"""
+    texto = ''.join(
+        c for c in unicodedata.normalize('NFD', str(texto))
+        if unicodedata.category(c) != 'Mn'
+    )
+    return texto.strip().lower()
+
+
+def _ngramas(texto):
+    return {texto[i:i + TAMANO_NGRAMA] for i in range(len(texto) - TAMANO_NGRAMA + 1)}
+
+
+class IndiceBusqueda:
+    """Índice de prefijos y n-gramas sobre los valores distintos de las columnas de búsqueda.
+
+    Cada columna se factoriza una sola vez: las filas guardan un código entero y el
+    índice trabaja únicamente sobre los valores distintos, de modo que una búsqueda
+    cuesta O(valores distintos) más un acceso vectorizado por fila.
+    """
+
+    def __init__(self, datos, columnas=COLUMNAS_BUSQUEDA):
+        self.datos = datos
+        self.codigos = {}
+        self.claves = {}
+        self.tokens = {}
+        self.ngramas = {}
+        self.rangos = {}
+        for col in columnas:
+            if col not in datos.columns:
+                continue
+            codigos, valores = pd.factorize(datos[col].astype(str))
+            claves = [clave_busqueda(v) for v in valores]
+
+            # Prefijos: lista ordenada de (palabra, código) para búsquedas con bisect
+            tokens = sorted(
+                (token, i)
+                for i, clave in enumerate(claves)
+                for token in set(clave.replace(",", " ").split())
+            )
+
+            # N-gramas: n-grama -> códigos de los valores que lo contienen
+            ngramas = {}
+            for i, clave in enumerate(claves):
+                for ngrama in _ngramas(clave):
+                    ngramas.setdefault(ngrama, []).append(i)
+
+            self.codigos[col] = codigos
+            self.claves[col] = claves
+            self.tokens[col] = tokens
+            self.ngramas[col] = {k: np.array(v, dtype=np.int32) for k, v in ngramas.items()}
+
+    def _buscar_valores(self, col, termino):
+        """Regresa los códigos de los valores distintos de `col` que contienen `termino`"""
+        claves = self.claves[col]
+        if len(termino) < TAMANO_NGRAMA:
+            tokens = self.tokens[col]
+            inicio = bisect.bisect_left(tokens, (termino,))
+            fin = bisect.bisect_left(tokens, (termino + "\uffff",))
+            return np.unique(np.array([i for _, i in tokens[inicio:fin]], dtype=np.int32))
+
+        candidatos = None
+        for ngrama in _ngramas(termino):
+            lista = self.ngramas[col].get(ngrama)
+            if lista is None:
+                return np.array([], dtype=np.int32)
+            candidatos = lista if candidatos is None else np.intersect1d(candidatos, lista, assume_unique=True)
+        return np.array([i for i in candidatos if termino in claves[i]], dtype=np.int32)
+
+    def filtrar(self, texto, posiciones):
+        """Máscara booleana sobre `posiciones` con las filas que coinciden con todos los términos"""
+        mascara = np.ones(len(posiciones), dtype=bool)
+        for termino in clave_busqueda(texto).split():
+            coincide = np.zeros(len(posiciones), dtype=bool)
+            for col, codigos in self.codigos.items():
+                encontrados = np.zeros(len(self.claves[col]), dtype=bool)
+                encontrados[self._buscar_valores(col, termino)] = True
+                coincide |= encontrados[codigos[posiciones]]
+            mascara &= coincide
+        return mascara
+
+    def rango(self, col):
+        """Posición de cada fila en el orden global de `col` (se calcula una vez por columna)"""
+        if col not in self.rangos:
+            orden = self.datos[col].reset_index(drop=True).sort_values(kind="stable", na_position="last").index.to_numpy()
+            rango = np.empty(len(orden), dtype=np.int64)
+            rango[orden] = np.arange(len(orden))
+            self.rangos[col] = rango
+        return self.rangos[col]
+
+    def pagina(self, posiciones, col_orden, ascendente, numero, tamano):
+        """Posiciones de la página solicitada, ordenadas por `col_orden` sin tocar las demás columnas"""
+        claves_orden = self.rango(col_orden)[posiciones]
+        if not ascendente:
+            claves_orden = -claves_orden
+        fin = min(numero * tamano, len(posiciones))
+        inicio = (numero - 1) * tamano
+        if fin < len(posiciones):
+            # Solo se ordenan las filas que llegan hasta la página pedida
+            parcial = np.argpartition(claves_orden, fin - 1)[:fin]
+            orden = parcial[np.argsort(claves_orden[parcial], kind="stable")]
+        else:
+            orden = np.argsort(claves_orden, kind="stable")
+        return posiciones[orden[inicio:fin]]
+
+
+def mostrar_tabla_detalle(datos, datos_filtrados, indice, prefijo="detalle"):
+    """Tabla paginada de bitácoras: solo la página visible se envía al navegador"""
+    columnas = list(datos.columns)
+
+    col_busqueda, col_orden, col_direccion = st.columns([3, 2, 1])
+    with col_busqueda:
+        texto = st.text_input("🔎 Buscar en Proyecto, Cultivo(s) o Id_Productor", key=f"{prefijo}_buscar")
+    with col_orden:
+        col_ordenar = st.selectbox("Ordenar por", columnas, index=columnas.index("Anio"), key=f"{prefijo}_orden")
+    with col_direccion:
+        ascendente = st.toggle("Ascendente", value=True, key=f"{prefijo}_ascendente")
+
+    columnas_visibles = st.multiselect(
+        "Columnas",
+        columnas,
+        default=[c for c in COLUMNAS_DETALLE if c in columnas],
+        key=f"{prefijo}_columnas"
+    ) or columnas
+
+    posiciones = datos.index.get_indexer(datos_filtrados.index)
+    if texto.strip():
+        posiciones = posiciones[indice.filtrar(texto, posiciones)]
+
+    total = len(posiciones)
+    col_tamano, col_pagina, col_info = st.columns([1, 1, 3])
+    with col_tamano:
+        tamano = st.selectbox("Filas por página", FILAS_POR_PAGINA, key=f"{prefijo}_tamano")
+    paginas = max(1, math.ceil(total / tamano))
+    with col_pagina:
+        numero = st.number_input("Página", min_value=1, max_value=paginas, value=1, step=1, key=f"{prefijo}_pagina_{paginas}")
+    numero = min(int(numero), paginas)
+
+    pagina = indice.pagina(posiciones, col_ordenar, ascendente, numero, tamano)
+    with col_info:
+        st.write("")
+        if total:
+            st.caption(f"Filas {(numero - 1) * tamano + 1:,}–{(numero - 1) * tamano + len(pagina):,} de {total:,} · Página {numero} de {paginas}")
+        else:
+            st.caption("No hay bitácoras que coincidan con la búsqueda.")
+
+    st.dataframe(datos.iloc[pagina][columnas_visibles], use_container_width=True, hide_index=True)